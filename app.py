@@ -5,35 +5,63 @@ A comprehensive interface for automating genomics impact assessment workflows,
 from VCF input to final report generation.
 """
 
+import functools
+import io
+import itertools
 import os
+import re
+import shutil
 import subprocess
 import streamlit as st
 import pandas as pd
 import time
 import json
+from collections import deque
+from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import tempfile
+import uuid
 import zipfile
+import zlib
+
+# Prefer Arrow's multithreaded CSV reader for uploads when pyarrow is available
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+# Chunk size for copying uploaded files to disk
+UPLOAD_COPY_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Pasted variant lists at least this long are parsed with pandas
+VECTORIZED_PARSE_MIN_LINES = 32
+
+# Matches `export KEY=value` lines; comments and blank lines never match
+_ENV_EXPORT_PATTERN = re.compile(r'^[ \t]*export[ \t]+([^=\s]+)=(.*)$', re.MULTILINE)
+
 
 # Load environment variables from .env.example
 def load_env_file():
     """Load environment variables from .env.example file."""
     env_file = Path(__file__).parent / ".env.example"
     if env_file.exists():
-        # Read and parse the .env.example file
-        with open(env_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line and not line.startswith('#') and line.startswith('export '):
-                    # Extract variable name and value from export statement
-                    export_line = line[7:]  # Remove 'export '
-                    if '=' in export_line:
-                        key, value = export_line.split('=', 1)
-                        # Remove quotes if present
-                        value = value.strip('"\'')
-                        os.environ[key] = value
+        # Parse all export statements in one pass, removing quotes if present
+        text = env_file.read_text()
+        parsed = {
+            key: value.strip().strip('"\'')
+            for key, value in _ENV_EXPORT_PATTERN.findall(text)
+        }
+        
+        # Streamlit re-executes this module on every rerun; only touch variables
+        # whose value differs so unchanged keys skip the putenv call
+        changed = {key: value for key, value in parsed.items() if os.environ.get(key) != value}
+        if changed:
+            os.environ.update(changed)
 
 # Load environment variables at startup
 load_env_file()
@@ -45,6 +73,46 @@ from genomics_automation.transvar_adapter import TransVarAdapter
 from genomics_automation.vcf_builder import BatchVCFProcessor, VariantClassifier
 from genomics_automation.utils import generate_run_id, read_csv_with_encoding_detection
 
+# Share of the progress bar credited to each stage, keyed by stage value
+STAGE_PROGRESS_WEIGHTS: Dict[str, float] = {
+    PipelineStage.INPUT_VALIDATION.value: 0.05,
+    PipelineStage.TRANSVAR_ANNOTATION.value: 0.20,
+    PipelineStage.VCF_GENERATION.value: 0.10,
+    PipelineStage.SARJ_GENERATION.value: 0.20,
+    PipelineStage.TPS_PROCESSING.value: 0.25,
+    PipelineStage.JSON_TO_CSV.value: 0.10,
+    PipelineStage.REPORT_EXTRACTION.value: 0.10
+}
+STAGE_PROGRESS_TOTAL = sum(STAGE_PROGRESS_WEIGHTS.values())
+
+# Uploaded CSV preview size and Arrow read block size
+CSV_PREVIEW_ROWS = 1000
+CSV_BLOCK_SIZE = 1 << 22  # 4 MiB
+
+# JSON to CSV converter scripts selectable in the sidebar
+ENHANCED_CSV_SCRIPT = "/workspaces/Impact-Assessment/external_tools/enhanced_json_to_csv.py"
+BASIC_CSV_SCRIPT = "/workspaces/Impact-Assessment/external_tools/mock_json_to_csv.py"
+
+# Read buffer for log files shown in the debug tab
+LOG_READ_BUFFER_SIZE = 1 << 16  # 64 KiB
+
+# Only the tail of each log is shown until the full log is requested
+LOG_TAIL_BYTES = 256 * 1024
+
+# Copy buffer for streaming artifacts into results archives
+ZIP_COPY_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Artifacts up to this size are compressed in memory on worker threads; larger ones stream from disk
+ZIP_PARALLEL_MAX_BYTES = 8 << 20  # 8 MiB
+
+# Already-compressed artifact types that are stored in results archives as-is
+NO_RECOMPRESS_SUFFIXES = frozenset({'.gz', '.bgz', '.bam', '.cram', '.zip', '.xz', '.zst'})
+
+# Bound on retained status messages and how many the progress panel shows
+PROGRESS_HISTORY_LIMIT = 200
+PROGRESS_DETAILS_SHOWN = 10
+PROGRESS_TIME_FORMAT = '%H:%M:%S'
+
 
 # Page configuration
 st.set_page_config(
@@ -91,12 +159,272 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+@st.cache_data(show_spinner=False)
+def _read_artifact_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Read an artifact for download; mtime/size key the cache so reruns skip the read."""
+    return Path(path).read_bytes()
+
+
+def _artifact_bytes(path, stat_result: Optional[os.stat_result] = None) -> bytes:
+    """Return artifact bytes via the cache, keyed on the file's current stat."""
+    if stat_result is None:
+        stat_result = os.stat(path)
+    return _read_artifact_bytes(str(path), stat_result.st_mtime_ns, stat_result.st_size)
+
+
+def _format_errors(errors: List[str]) -> str:
+    """Combine error messages into one block so they render as a single element."""
+    return "\n\n".join(f"• {error}" for error in errors)
+
+
+def _safe_size(path) -> Optional[int]:
+    """Return a file's size with a single stat call, or None if it cannot be read."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+@st.cache_data(show_spinner=False)
+def _artifact_sizes(run_id: str, artifact_paths: tuple) -> Dict[str, Optional[int]]:
+    """Stat each artifact once per run; reruns of the results tabs reuse the sizes."""
+    return {path: _safe_size(path) for path in artifact_paths}
+
+
+def _flatten_artifacts(artifacts: Dict[str, Any]) -> List[tuple[str, Optional[str], Any, bool]]:
+    """
+    Flatten result artifacts into (artifact_name, member, value, is_path) entries.
+    
+    Lists and dicts of files are expanded once here, with member set to the
+    1-based list position or dict key (None for single artifacts), so the
+    render and ZIP loops iterate a flat list without type dispatch.
+    """
+    flat = []
+    for artifact_name, artifact_value in artifacts.items():
+        if not artifact_value:
+            continue
+        if isinstance(artifact_value, list):
+            members = ((str(i + 1), value) for i, value in enumerate(artifact_value))
+        elif isinstance(artifact_value, dict):
+            members = ((str(key), value) for key, value in artifact_value.items())
+        else:
+            members = ((None, artifact_value),)
+        for member, value in members:
+            flat.append((artifact_name, member, value, bool(value) and isinstance(value, (str, Path))))
+    return flat
+
+
+def _deflate_zip_entry(file_path, arcname: str, level: int) -> Optional[tuple[zipfile.ZipInfo, bytes, int, int]]:
+    """
+    Compress a small file into a raw DEFLATE stream for a results archive member.
+    
+    Runs on worker threads (zlib releases the GIL), so archives with several
+    artifacts compress on multiple cores.
+    
+    Returns:
+        Tuple of (ZipInfo, compressed bytes, CRC-32, uncompressed size),
+        or None if the file no longer exists
+    """
+    try:
+        zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        with open(file_path, 'rb') as src:
+            raw = src.read()
+    except FileNotFoundError:
+        return None
+    
+    # Same raw-deflate parameters zipfile uses for ZIP_DEFLATED members
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    data = compressor.compress(raw) + compressor.flush()
+    return zinfo, data, zlib.crc32(raw), len(raw)
+
+
+class _PassThroughCompressor:
+    """Compressor stand-in for a zipfile write handle fed already-deflated data."""
+    
+    @staticmethod
+    def compress(data: bytes) -> bytes:
+        return data
+    
+    @staticmethod
+    def flush() -> bytes:
+        return b''
+
+
+def _write_precompressed_entry(
+    zipf: zipfile.ZipFile,
+    zinfo: zipfile.ZipInfo,
+    data: bytes,
+    crc: int,
+    file_size: int
+) -> None:
+    """
+    Append a member whose raw DEFLATE data, CRC and size are already known.
+    
+    ZipFile.open(..., 'w') still does the header offset, ZIP64 decision, local
+    header rewrite and central directory bookkeeping; only the handle's
+    compressor is swapped for a pass-through, and the CRC and uncompressed
+    size computed on the worker replace the ones it tallies from the written bytes.
+    """
+    zinfo.compress_type = zipfile.ZIP_DEFLATED
+    zinfo.file_size = file_size  # ZipFile.open sizes the ZIP64 decision from this
+    with zipf.open(zinfo, 'w') as dst:
+        dst._compressor = _PassThroughCompressor
+        dst.write(data)
+        dst._crc = crc
+        dst._file_size = file_size
+
+
+def _tail(path, max_bytes: int = LOG_TAIL_BYTES) -> tuple[str, bool]:
+    """
+    Read the last `max_bytes` of a text file.
+    
+    Returns:
+        Tuple of (text, truncated) where truncated is True if earlier content was skipped
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        start = max(0, size - max_bytes)
+        f.seek(start)
+        return f.read().decode('utf-8', 'replace'), start > 0
+
+
+def _lookup_dir_entry(path, index: Dict[str, Dict[str, os.DirEntry]]) -> Optional[os.DirEntry]:
+    """
+    Find the directory entry for a file, scanning its parent directory at most once.
+    
+    Presence in the scan doubles as the existence check, and DirEntry caches
+    its stat result, so each directory costs a single readdir.
+    """
+    parent, name = os.path.split(os.fspath(path))
+    if parent not in index:
+        try:
+            with os.scandir(parent or '.') as entries:
+                index[parent] = {entry.name: entry for entry in entries if entry.is_file()}
+        except OSError:
+            index[parent] = {}
+    return index[parent].get(name)
+
+
+def _parse_combined_variants(combined_input: str) -> List[Dict[str, str]]:
+    """Parse `Gene:p.Change` lines, using vectorized string ops for large pastes."""
+    lines = combined_input.strip().splitlines()
+    
+    # Small inputs are cheaper to split in plain Python than to build a Series
+    if len(lines) < VECTORIZED_PARSE_MIN_LINES:
+        variants = []
+        for line in lines:
+            if ':' in line:
+                gene, protein_change = line.split(':', 1)
+                variants.append({
+                    'gene': gene.strip(),
+                    'protein_change': protein_change.strip()
+                })
+        return variants
+    
+    parts = pd.Series(lines, dtype=object).str.split(':', n=1, expand=True)
+    if parts.shape[1] < 2:
+        return []
+    parts.columns = ['gene', 'protein_change']
+    parts = parts.dropna()
+    parts['gene'] = parts['gene'].str.strip()
+    parts['protein_change'] = parts['protein_change'].str.strip()
+    return parts.to_dict(orient='records')
+
+
+@st.cache_data(show_spinner=False)
+def _load_csv_preview(data: bytes) -> pd.DataFrame:
+    """Parse the head of an uploaded CSV; cached on the upload's content hash."""
+    if HAS_PYARROW:
+        try:
+            # Stream record batches and stop once the preview rows are in hand
+            reader = pacsv.open_csv(
+                io.BytesIO(data),
+                read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                convert_options=pacsv.ConvertOptions(strings_can_be_null=True)
+            )
+            batches = []
+            rows = 0
+            for batch in reader:
+                batches.append(batch)
+                rows += batch.num_rows
+                if rows >= CSV_PREVIEW_ROWS:
+                    break
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            return table.slice(0, CSV_PREVIEW_ROWS).to_pandas()
+        except pa.ArrowInvalid:
+            # Arrow is stricter than pandas about malformed rows; let pandas try
+            pass
+    
+    return pd.read_csv(io.BytesIO(data), nrows=CSV_PREVIEW_ROWS)
+
+
+@st.cache_data(show_spinner=False)
+def _count_valid_csv_rows(data: bytes, gene_column: str, protein_column: str) -> tuple[int, int]:
+    """Count rows with both gene and protein change populated, returning (valid, total)."""
+    columns = list(dict.fromkeys([gene_column, protein_column]))
+    
+    if HAS_PYARROW:
+        try:
+            table = pacsv.read_csv(
+                io.BytesIO(data),
+                read_options=pacsv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+                convert_options=pacsv.ConvertOptions(include_columns=columns, strings_can_be_null=True)
+            )
+            valid_mask = pc.and_(pc.is_valid(table[gene_column]), pc.is_valid(table[protein_column]))
+            return int(pc.sum(valid_mask).as_py() or 0), table.num_rows
+        except pa.ArrowInvalid:
+            pass
+    
+    df = pd.read_csv(io.BytesIO(data), usecols=columns)
+    valid_rows = int((df[gene_column].notna() & df[protein_column].notna()).sum())
+    return valid_rows, len(df)
+
+
+def _remove_kb_config(kb_id: str) -> None:
+    """Button callback that drops a knowledge base from the sidebar by its id."""
+    kept = [
+        (existing_id, kb)
+        for existing_id, kb in zip(st.session_state.kb_config_ids, st.session_state.kb_configs)
+        if existing_id != kb_id
+    ]
+    st.session_state.kb_config_ids = [existing_id for existing_id, _ in kept]
+    st.session_state.kb_configs = [kb for _, kb in kept]
+
+
+@functools.lru_cache(maxsize=8)
+def _script_basename(script_path: str) -> str:
+    """Return the file name of a converter script path."""
+    return Path(script_path).name
+
+
+@st.cache_resource
+def _default_config() -> Config:
+    """Build the environment-derived default configuration once per process."""
+    return Config()
+
+
+@st.cache_resource(max_entries=64)
+def _get_pipeline(session_token: str, config_hash: str, _config: Config) -> GenomicsPipeline:
+    """
+    Construct a pipeline once per session and configuration fingerprint.
+    
+    The session token keeps pipelines (and their run state) private to a
+    browser session; the leading underscore excludes the config object
+    itself from Streamlit's cache hashing.
+    """
+    return GenomicsPipeline(_config)
+
+
 class StreamlitPipelineUI:
     """Main UI class for the Streamlit application."""
     
     def __init__(self):
         self.config = self._load_config()
-        self.pipeline = GenomicsPipeline(self.config)
+        
+        # Reuse the pipeline across reruns until the configuration changes
+        if 'session_token' not in st.session_state:
+            st.session_state.session_token = uuid.uuid4().hex
+        self.pipeline = _get_pipeline(st.session_state.session_token, self.config.stable_hash(), self.config)
         
         # Session state initialization
         if 'pipeline_running' not in st.session_state:
@@ -104,22 +432,36 @@ class StreamlitPipelineUI:
         if 'current_results' not in st.session_state:
             st.session_state.current_results = None
         if 'progress_messages' not in st.session_state:
-            st.session_state.progress_messages = []
+            st.session_state.progress_messages = deque(maxlen=PROGRESS_HISTORY_LIMIT)
+        
+        # Widget keys rendered during this script run (results can render twice per run)
+        self._rendered_widget_keys = set()
     
     def _load_config(self) -> Config:
         """Load configuration with Streamlit-specific overrides."""
-        config = Config()
-        
         # Override with session state if available
         if 'user_config' in st.session_state:
             return st.session_state.user_config
         
-        return config
+        # The sidebar mutates the config in place, so hand out a private copy
+        return _default_config().model_copy(deep=True)
     
     def _save_config(self) -> None:
         """Save current configuration to session state."""
         st.session_state.user_config = self.config
     
+    @staticmethod
+    def _enum_str(value: Any) -> str:
+        """Stringify a config value that may be an enum member or a plain string."""
+        return value.value if isinstance(value, Enum) else str(value)
+    
+    def _transvar_setting_strs(self) -> tuple[str, str]:
+        """Return the TransVar database and reference version as display strings."""
+        return (
+            self._enum_str(self.config.transvar.database),
+            self._enum_str(self.config.transvar.ref_version)
+        )
+    
     def render_sidebar(self) -> None:
         """Render the configuration sidebar."""
         st.sidebar.title("⚙️ Configuration")
@@ -156,8 +498,7 @@ class StreamlitPipelineUI:
         st.sidebar.subheader("TransVar Settings")
         
         # Handle both enum and string values for database
-        current_db = self.config.transvar.database
-        db_value = current_db.value if hasattr(current_db, 'value') else str(current_db)
+        db_value = self._enum_str(self.config.transvar.database)
         
         self.config.transvar.database = st.sidebar.selectbox(
             "Database",
@@ -167,8 +508,7 @@ class StreamlitPipelineUI:
         )
         
         # Handle both enum and string values for reference version
-        current_ref = self.config.transvar.ref_version
-        ref_value = current_ref.value if hasattr(current_ref, 'value') else str(current_ref)
+        ref_value = self._enum_str(self.config.transvar.ref_version)
         
         self.config.transvar.ref_version = st.sidebar.selectbox(
             "Reference Version",
@@ -254,14 +594,15 @@ class StreamlitPipelineUI:
             help="Choose between enhanced converter with protein changes or basic converter"
         )
         
-        # Update the script path based on selection
-        if csv_converter_type.startswith("Enhanced"):
-            self.config.paths.json_to_csv_script = "/workspaces/Impact-Assessment/external_tools/enhanced_json_to_csv.py"
-        else:
-            self.config.paths.json_to_csv_script = "/workspaces/Impact-Assessment/external_tools/mock_json_to_csv.py"
+        is_enhanced = csv_converter_type.startswith("Enhanced")
+        
+        # Update the script path based on selection, skipping no-op writes
+        selected_script = ENHANCED_CSV_SCRIPT if is_enhanced else BASIC_CSV_SCRIPT
+        if self.config.paths.json_to_csv_script != selected_script:
+            self.config.paths.json_to_csv_script = selected_script
         
         # CSV output options
-        if csv_converter_type.startswith("Enhanced"):
+        if is_enhanced:
             include_protein_changes = st.sidebar.checkbox(
                 "Include Protein Changes",
                 value=True,
@@ -288,7 +629,7 @@ class StreamlitPipelineUI:
             }
         
         # Display current CSV configuration
-        st.sidebar.info(f"📋 Current converter: {Path(self.config.paths.json_to_csv_script or '').name}")
+        st.sidebar.info(f"📋 Current converter: {_script_basename(self.config.paths.json_to_csv_script or '')}")
         
         # Knowledge Bases Configuration
         st.sidebar.subheader("Knowledge Bases")
@@ -309,25 +650,31 @@ class StreamlitPipelineUI:
         if 'kb_configs' not in st.session_state:
             st.session_state.kb_configs = self.config.paths.knowledge_bases or []
         
+        # Stable per-KB ids keep widget keys attached to the right KB across removals
+        if len(st.session_state.get('kb_config_ids', [])) != len(st.session_state.kb_configs):
+            st.session_state.kb_config_ids = [uuid.uuid4().hex for _ in st.session_state.kb_configs]
+        
         st.sidebar.write("Configure Knowledge Bases:")
         
         # Add new KB button
         if st.sidebar.button("+ Add Knowledge Base"):
             st.session_state.kb_configs.append(KBSpec(version="", path="", description=""))
+            st.session_state.kb_config_ids.append(uuid.uuid4().hex)
         
         # Render existing KBs
-        for i, kb in enumerate(st.session_state.kb_configs):
+        for i, (kb_id, kb) in enumerate(zip(st.session_state.kb_config_ids, st.session_state.kb_configs)):
             with st.sidebar.expander(f"KB {i+1}: {kb.version or 'New'}"):
-                kb.version = st.text_input(f"Version {i+1}", value=kb.version, key=f"kb_version_{i}")
-                kb.path = st.text_input(f"Path {i+1}", value=kb.path, key=f"kb_path_{i}")
-                kb.description = st.text_input(f"Description {i+1}", value=kb.description or "", key=f"kb_desc_{i}")
+                kb.version = st.text_input(f"Version {i+1}", value=kb.version, key=f"kb_version_{kb_id}")
+                kb.path = st.text_input(f"Path {i+1}", value=kb.path, key=f"kb_path_{kb_id}")
+                kb.description = st.text_input(f"Description {i+1}", value=kb.description or "", key=f"kb_desc_{kb_id}")
                 
-                if st.button(f"Remove KB {i+1}", key=f"remove_kb_{i}"):
-                    st.session_state.kb_configs.pop(i)
-                    st.rerun()
+                # Removal runs as a callback before the next script run, so no explicit rerun is needed
+                st.button(f"Remove KB {i+1}", key=f"remove_kb_{kb_id}", on_click=_remove_kb_config, args=(kb_id,))
         
-        # Update config
-        self.config.paths.knowledge_bases = [kb for kb in st.session_state.kb_configs if kb.version and kb.path]
+        # Update config only when the usable KB list actually changed
+        knowledge_bases = [kb for kb in st.session_state.kb_configs if kb.version and kb.path]
+        if knowledge_bases != self.config.paths.knowledge_bases:
+            self.config.paths.knowledge_bases = knowledge_bases
     
     def render_header(self) -> None:
         """Render the main application header."""
@@ -385,13 +732,7 @@ class StreamlitPipelineUI:
         variants = []
         
         if combined_input:
-            for line in combined_input.strip().split('\n'):
-                if ':' in line:
-                    gene, protein_change = line.split(':', 1)
-                    variants.append({
-                        'gene': gene.strip(),
-                        'protein_change': protein_change.strip()
-                    })
+            variants.extend(_parse_combined_variants(combined_input))
         
         if manual_gene and manual_protein:
             variants.append({
@@ -416,14 +757,17 @@ class StreamlitPipelineUI:
         )
         
         if uploaded_file is not None:
+            csv_bytes = uploaded_file.getvalue()
+            
             # Save uploaded file temporarily
             with tempfile.NamedTemporaryFile(delete=False, suffix='.csv') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, tmp_file, length=UPLOAD_COPY_CHUNK_SIZE)
                 tmp_path = Path(tmp_file.name)
             
             # Preview the CSV
             try:
-                df = pd.read_csv(tmp_path)
+                df = _load_csv_preview(csv_bytes)
                 st.write("**CSV Preview:**")
                 st.dataframe(df.head())
                 
@@ -446,12 +790,8 @@ class StreamlitPipelineUI:
                     )
                 
                 if st.button("Validate CSV"):
-                    valid_rows = 0
-                    for _, row in df.iterrows():
-                        if pd.notna(row[gene_column]) and pd.notna(row[protein_column]):
-                            valid_rows += 1
-                    
-                    st.info(f"Found {valid_rows} valid variant rows out of {len(df)} total rows")
+                    valid_rows, total_rows = _count_valid_csv_rows(csv_bytes, gene_column, protein_column)
+                    st.info(f"Found {valid_rows} valid variant rows out of {total_rows} total rows")
                 
                 return PipelineInput(mode="csv", data=tmp_path)
             
@@ -473,28 +813,38 @@ class StreamlitPipelineUI:
         if uploaded_file is not None:
             # Save uploaded file temporarily
             with tempfile.NamedTemporaryFile(delete=False, suffix='.vcf') as tmp_file:
-                tmp_file.write(uploaded_file.getvalue())
+                uploaded_file.seek(0)
+                shutil.copyfileobj(uploaded_file, tmp_file, length=UPLOAD_COPY_CHUNK_SIZE)
                 tmp_path = Path(tmp_file.name)
             
             # Validate VCF
             try:
-                with open(tmp_path, 'r') as f:
-                    lines = f.readlines()
-                
-                header_lines = [line for line in lines if line.startswith('#')]
-                variant_lines = [line for line in lines if not line.startswith('#') and line.strip()]
+                # Single streaming pass: count records, keep only the preview lines
+                header_count = 0
+                variant_count = 0
+                preview = []
+                with open(tmp_path, 'rb') as f:
+                    for line in f:
+                        if line[:1] == b'#':
+                            header_count += 1
+                        elif line.strip():
+                            variant_count += 1
+                            if len(preview) < 5:
+                                preview.append(line)
                 
-                st.success(f"VCF file validated: {len(variant_lines)} variants, {len(header_lines)} header lines")
+                st.success(f"VCF file validated: {variant_count} variants, {header_count} header lines")
                 
                 # Show preview
-                if variant_lines:
+                if preview:
                     st.write("**Variant Preview:**")
-                    preview_lines = variant_lines[:5]
-                    for i, line in enumerate(preview_lines, 1):
-                        st.text(f"{i}: {line.strip()}")
+                    preview_text = '\n'.join(
+                        f"{i}: {line.decode('utf-8', errors='replace').strip()}"
+                        for i, line in enumerate(preview, 1)
+                    )
+                    st.code(preview_text, language='text')
                     
-                    if len(variant_lines) > 5:
-                        st.text(f"... and {len(variant_lines) - 5} more variants")
+                    if variant_count > 5:
+                        st.text(f"... and {variant_count - 5} more variants")
                 
                 return PipelineInput(mode="vcf", data=tmp_path)
             
@@ -531,7 +881,8 @@ class StreamlitPipelineUI:
         self._clear_download_session_state()
         
         st.session_state.pipeline_running = True
-        st.session_state.progress_messages = []
+        st.session_state.progress_messages = deque(maxlen=PROGRESS_HISTORY_LIMIT)
+        st.session_state.completed_stages = set()
         
         # Create progress tracking
         progress_bar = st.progress(0)
@@ -546,20 +897,12 @@ class StreamlitPipelineUI:
                 'error': status.error,
                 'timestamp': time.time()
             })
+            st.session_state.completed_stages.add(status.stage.value)
             
             # Update progress bar
-            stage_weights = {
-                PipelineStage.INPUT_VALIDATION: 0.05,
-                PipelineStage.TRANSVAR_ANNOTATION: 0.20,
-                PipelineStage.VCF_GENERATION: 0.10,
-                PipelineStage.SARJ_GENERATION: 0.20,
-                PipelineStage.TPS_PROCESSING: 0.25,
-                PipelineStage.JSON_TO_CSV: 0.10,
-                PipelineStage.REPORT_EXTRACTION: 0.10
-            }
-            
-            total_progress = sum(stage_weights[stage] for stage in PipelineStage 
-                               if any(msg['stage'] == stage.value for msg in st.session_state.progress_messages))
+            total_progress = sum(
+                STAGE_PROGRESS_WEIGHTS.get(stage, 0.0) for stage in st.session_state.completed_stages
+            ) / STAGE_PROGRESS_TOTAL
             
             progress_bar.progress(min(total_progress, 1.0))
             
@@ -567,7 +910,7 @@ class StreamlitPipelineUI:
             with status_container:
                 self._render_progress_status()
         
-        # Set up pipeline with callback
+        # Set up pipeline with callback (removed again below since the pipeline is reused)
         self.pipeline.add_status_callback(status_callback)
         
         try:
@@ -580,13 +923,14 @@ class StreamlitPipelineUI:
                 self._render_results(result)
             else:
                 st.error("❌ Pipeline failed")
-                for error in result.errors:
-                    st.error(error)
+                if result.errors:
+                    st.error(_format_errors(result.errors))
         
         except Exception as e:
             st.error(f"Unexpected error: {e}")
         
         finally:
+            self.pipeline.remove_status_callback(status_callback)
             st.session_state.pipeline_running = False
             progress_bar.progress(1.0)
     
@@ -609,8 +953,9 @@ class StreamlitPipelineUI:
         
         # Show progress details
         with st.expander("View Progress Details"):
-            for msg in reversed(st.session_state.progress_messages[-10:]):  # Last 10 messages
-                timestamp = time.strftime('%H:%M:%S', time.localtime(msg['timestamp']))
+            recent = itertools.islice(reversed(st.session_state.progress_messages), PROGRESS_DETAILS_SHOWN)
+            for msg in recent:
+                timestamp = time.strftime(PROGRESS_TIME_FORMAT, time.localtime(msg['timestamp']))
                 stage = msg['stage'].replace('_', ' ').title()
                 st.text(f"[{timestamp}] {stage}: {msg['message']}")
     
@@ -637,14 +982,17 @@ class StreamlitPipelineUI:
         # Results tabs
         tab1, tab2, tab3, tab4 = st.tabs(["📋 Summary", "📁 Downloads", "📈 Metrics", "🔧 Debug"])
         
+        # Flatten nested artifact lists/dicts once for the downloads, ZIP and metrics tabs
+        flat_artifacts = _flatten_artifacts(result.artifacts)
+        
         with tab1:
             self._render_results_summary(result)
         
         with tab2:
-            self._render_downloads(result)
+            self._render_downloads(result, flat_artifacts)
         
         with tab3:
-            self._render_metrics(result)
+            self._render_metrics(result, flat_artifacts)
         
         with tab4:
             self._render_debug_info(result)
@@ -674,22 +1022,22 @@ class StreamlitPipelineUI:
     
     def _clear_download_session_state(self) -> None:
         """Clear any download-related session state keys to prevent duplicates."""
-        keys_to_remove = []
-        for key in st.session_state.keys():
-            if (key.startswith('download_') or 
-                key.startswith('zip_button_') or 
-                key.startswith('downloads_rendered_')):
-                keys_to_remove.append(key)
-        
-        for key in keys_to_remove:
-            del st.session_state[key]
+        download_keys = st.session_state.get('_download_keys', set())
+        for key in download_keys:
+            st.session_state.pop(key, None)
+        download_keys.clear()
+    
+    def _download_key(self, key: str) -> str:
+        """Register a download-related session state key so it can be cleared later."""
+        st.session_state.setdefault('_download_keys', set()).add(key)
+        return key
     
-    def _render_downloads(self, result) -> None:
+    def _render_downloads(self, result, flat_artifacts) -> None:
         """Render download section."""
         st.subheader("Download Results")
         
         # Use a unique container ID to prevent re-rendering
-        downloads_container_key = f"downloads_rendered_{result.run_id}"
+        downloads_container_key = self._download_key(f"downloads_rendered_{result.run_id}")
         
         # Check if downloads for this run_id have already been rendered
         if downloads_container_key in st.session_state:
@@ -700,125 +1048,153 @@ class StreamlitPipelineUI:
         st.session_state[downloads_container_key] = True
         
         # Create download buttons for each artifact
-        for artifact_name, artifact_path in result.artifacts.items():
-            if artifact_path:
-                # Handle different artifact path types
-                if isinstance(artifact_path, list):
-                    # Multiple files - create download buttons for each
-                    for i, file_path in enumerate(artifact_path):
-                        if file_path and isinstance(file_path, (str, Path)) and Path(file_path).exists():
-                            with open(file_path, 'rb') as f:
-                                st.download_button(
-                                    label=f"📥 Download {artifact_name.replace('_', ' ').title()} ({i+1})",
-                                    data=f.read(),
-                                    file_name=Path(file_path).name,
-                                    mime='application/octet-stream',
-                                    key=f"download_{result.run_id}_{artifact_name}_{i}"
-                                )
-                elif isinstance(artifact_path, dict):
-                    # Dictionary of files (e.g., knowledge base specific files)
-                    for kb_name, file_path in artifact_path.items():
-                        if file_path and isinstance(file_path, (str, Path)) and Path(file_path).exists():
-                            with open(file_path, 'rb') as f:
-                                st.download_button(
-                                    label=f"📥 Download {artifact_name.replace('_', ' ').title()} ({kb_name})",
-                                    data=f.read(),
-                                    file_name=Path(file_path).name,
-                                    mime='application/octet-stream',
-                                    key=f"download_{result.run_id}_{artifact_name}_{kb_name}"
-                                )
-                else:
-                    # Single file
-                    if isinstance(artifact_path, (str, Path)) and Path(artifact_path).exists():
-                        with open(artifact_path, 'rb') as f:
-                            st.download_button(
-                                label=f"📥 Download {artifact_name.replace('_', ' ').title()}",
-                                data=f.read(),
-                                file_name=Path(artifact_path).name,
-                                mime='application/octet-stream',
-                                key=f"download_{result.run_id}_{artifact_name}"
-                            )
+        dir_index = {}
+        for artifact_name, member, file_path, is_path in flat_artifacts:
+            if not is_path:
+                continue
+            entry = _lookup_dir_entry(file_path, dir_index)
+            if entry is not None:
+                label = artifact_name.replace('_', ' ').title()
+                st.download_button(
+                    label=f"📥 Download {label} ({member})" if member else f"📥 Download {label}",
+                    data=_artifact_bytes(entry.path, entry.stat()),
+                    file_name=entry.name,
+                    mime='application/octet-stream',
+                    key=self._download_key(
+                        f"download_{result.run_id}_{artifact_name}_{member}" if member
+                        else f"download_{result.run_id}_{artifact_name}"
+                    )
+                )
         
         # Zip all artifacts
-        if st.button("📦 Download All Results (ZIP)", key=f"zip_button_{result.run_id}"):
-            zip_path = self._create_results_zip(result)
+        if st.button("📦 Download All Results (ZIP)", key=self._download_key(f"zip_button_{result.run_id}")):
+            # Reuse the archive from an earlier click instead of re-zipping
+            zip_cache_key = f"zip_cache_{result.run_id}"
+            zip_path = st.session_state.get(zip_cache_key)
+            if not zip_path or not zip_path.exists():
+                zip_path = self._create_results_zip(result, flat_artifacts)
+                st.session_state[zip_cache_key] = zip_path
             if zip_path:
-                with open(zip_path, 'rb') as f:
-                    st.download_button(
-                        label="📥 Download Results ZIP",
-                        data=f.read(),
-                        file_name=f"genomics_results_{result.run_id}.zip",
-                        mime='application/zip',
-                        key=f"download_zip_{result.run_id}"
-                    )
+                st.download_button(
+                    label="📥 Download Results ZIP",
+                    data=_artifact_bytes(zip_path),
+                    file_name=f"genomics_results_{result.run_id}.zip",
+                    mime='application/zip',
+                    key=self._download_key(f"download_zip_{result.run_id}")
+                )
     
-    def _create_results_zip(self, result) -> Optional[Path]:
+    def _create_results_zip(self, result, flat_artifacts) -> Optional[Path]:
         """Create a ZIP file with all results."""
         try:
             zip_path = result.run_directory / f"results_{result.run_id}.zip"
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for artifact_name, artifact_path in result.artifacts.items():
-                    if artifact_path:
-                        # Handle both single files and lists of files
-                        if isinstance(artifact_path, list):
-                            for i, file_path in enumerate(artifact_path):
-                                if file_path and Path(file_path).exists():
-                                    # Create unique names for multiple files
-                                    base_name = Path(file_path).stem
-                                    ext = Path(file_path).suffix
-                                    zip_name = f"{artifact_name}_{i+1}_{base_name}{ext}"
-                                    zipf.write(file_path, zip_name)
-                        else:
-                            if Path(artifact_path).exists():
-                                zipf.write(artifact_path, Path(artifact_path).name)
+            entries = []
+            for artifact_name, member, file_path, is_path in flat_artifacts:
+                if not is_path:
+                    continue
+                if member:
+                    # Create unique names for multiple files
+                    file_path = Path(file_path)
+                    zip_name = f"{artifact_name}_{member}_{file_path.stem}{file_path.suffix}"
+                else:
+                    zip_name = Path(file_path).name
+                entries.append((file_path, zip_name))
+            
+            # Low DEFLATE levels keep most of the size win on text artifacts at a fraction of the CPU cost
+            level = self.config.processing.zip_compression_level
+            window = max(1, self.config.processing.max_workers)
+            with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED,
+                                 compresslevel=level, allowZip64=True) as zipf, \
+                    ThreadPoolExecutor(max_workers=window) as executor:
+                # Members are written in artifact order; small compressible files are
+                # deflated ahead on the workers, with at most `window` held in memory
+                queued = deque()
+                for file_path, zip_name in entries:
+                    future = None
+                    if Path(file_path).suffix.lower() not in NO_RECOMPRESS_SUFFIXES:
+                        try:
+                            file_size = os.stat(file_path).st_size
+                        except FileNotFoundError:
+                            continue
+                        if file_size <= ZIP_PARALLEL_MAX_BYTES:
+                            future = executor.submit(_deflate_zip_entry, file_path, zip_name, level)
+                    queued.append((future, file_path, zip_name))
+                    
+                    if len(queued) >= window:
+                        self._write_queued_entry(zipf, *queued.popleft())
+                
+                while queued:
+                    self._write_queued_entry(zipf, *queued.popleft())
             
             return zip_path
         except Exception as e:
             st.error(f"Error creating ZIP file: {e}")
             return None
     
-    def _render_metrics(self, result) -> None:
+    def _write_queued_entry(self, zipf: zipfile.ZipFile, future, file_path, arcname: str) -> None:
+        """Write a member compressed by a _deflate_zip_entry future, or stream it when there is none."""
+        if future is None:
+            self._write_zip_entry(zipf, file_path, arcname)
+            return
+        entry = future.result()
+        if entry is not None:
+            _write_precompressed_entry(zipf, *entry)
+    
+    def _write_zip_entry(self, zipf: zipfile.ZipFile, file_path, arcname: str) -> None:
+        """
+        Add a file to the archive, storing already-compressed formats without DEFLATE.
+        
+        Missing files are skipped; attempting the write and catching the error
+        touches the filesystem once instead of an exists() check plus the read.
+        """
+        try:
+            zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+        except FileNotFoundError:
+            return
+        
+        if Path(file_path).suffix.lower() in NO_RECOMPRESS_SUFFIXES:
+            zinfo.compress_type = zipfile.ZIP_STORED
+        else:
+            zinfo.compress_type = zipf.compression
+            zinfo._compresslevel = zipf.compresslevel  # what ZipFile.write sets for its entries
+        
+        # Stream through a 1 MiB buffer; ZipFile.write copies in 8 KiB chunks
+        with open(file_path, 'rb') as src, zipf.open(zinfo, 'w') as dst:
+            shutil.copyfileobj(src, dst, length=ZIP_COPY_CHUNK_SIZE)
+    
+    def _render_metrics(self, result, flat_artifacts) -> None:
         """Render detailed metrics."""
         st.subheader("Detailed Metrics")
         
+        # Collect lines and emit them as one markdown block instead of one element each
         if result.metrics:
-            for key, value in result.metrics.items():
-                st.write(f"**{key.replace('_', ' ').title()}:** {value}")
+            st.markdown("\n\n".join(
+                f"**{key.replace('_', ' ').title()}:** {value}" for key, value in result.metrics.items()
+            ))
         
         # Artifact details
         st.write("**Artifact Details:**")
-        for artifact_name, artifact_path in result.artifacts.items():
-            if artifact_path:
-                # Handle different artifact path types
-                if isinstance(artifact_path, list):
-                    # Multiple files in a list
-                    for i, file_path in enumerate(artifact_path):
-                        # Ensure file_path is a string/path-like object, not an integer or other type
-                        if file_path and isinstance(file_path, (str, Path)) and Path(file_path).exists():
-                            file_size = Path(file_path).stat().st_size
-                            st.write(f"- {artifact_name} ({i+1}): {file_size:,} bytes")
-                        elif file_path is not None:
-                            # Log what we got instead of a path
-                            st.write(f"- {artifact_name} ({i+1}): {type(file_path).__name__} value: {file_path}")
-                elif isinstance(artifact_path, dict):
-                    # Dictionary of files (e.g., knowledge base specific files)
-                    for kb_name, file_path in artifact_path.items():
-                        # Ensure file_path is a string/path-like object, not an integer
-                        if file_path and isinstance(file_path, (str, Path)) and Path(file_path).exists():
-                            file_size = Path(file_path).stat().st_size
-                            st.write(f"- {artifact_name} ({kb_name}): {file_size:,} bytes")
-                        elif file_path is not None:
-                            # Log what we got instead of a path
-                            st.write(f"- {artifact_name} ({kb_name}): {type(file_path).__name__} value: {file_path}")
-                else:
-                    # Single file path
-                    try:
-                        if Path(artifact_path).exists():
-                            file_size = Path(artifact_path).stat().st_size
-                            st.write(f"- {artifact_name}: {file_size:,} bytes")
-                    except (TypeError, ValueError) as e:
-                        st.write(f"- {artifact_name}: Invalid path format ({type(artifact_path).__name__})")
+        # Hashable snapshot of the paths so sizes are stat'd once per run, not on every rerun
+        sizes = _artifact_sizes(
+            result.run_id,
+            tuple(str(value) for _, _, value, is_path in flat_artifacts if is_path)
+        )
+        
+        detail_lines = []
+        for artifact_name, member, value, is_path in flat_artifacts:
+            label = f"{artifact_name} ({member})" if member else artifact_name
+            file_size = sizes.get(str(value)) if is_path else None
+            if file_size is not None:
+                detail_lines.append(f"- {label}: {file_size:,} bytes")
+            elif member is not None:
+                if value is not None:
+                    # Log what we got instead of a path
+                    detail_lines.append(f"- {label}: {type(value).__name__} value: {value}")
+            elif not is_path:
+                detail_lines.append(f"- {label}: Invalid path format ({type(value).__name__})")
+        
+        if detail_lines:
+            st.markdown("\n".join(detail_lines))
     
     def _render_debug_info(self, result) -> None:
         """Render debug information."""
@@ -827,11 +1203,7 @@ class StreamlitPipelineUI:
         st.write("**Configuration Used:**")
         
         # Handle both enum and string values safely
-        db_value = self.config.transvar.database
-        db_str = db_value.value if hasattr(db_value, 'value') else str(db_value)
-        
-        ref_value = self.config.transvar.ref_version
-        ref_str = ref_value.value if hasattr(ref_value, 'value') else str(ref_value)
+        db_str, ref_str = self._transvar_setting_strs()
         
         config_dict = {
             'transvar_database': db_str,
@@ -843,18 +1215,34 @@ class StreamlitPipelineUI:
         
         if result.errors:
             st.write("**Errors:**")
-            for error in result.errors:
-                st.error(error)
+            st.error(_format_errors(result.errors))
         
-        # Log files
-        log_files = list(result.run_directory.glob("*.log"))
+        # Log files (scandir reuses the dirent type, avoiding a stat per entry)
+        try:
+            with os.scandir(result.run_directory) as entries:
+                log_files = [
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith('.log') and entry.is_file(follow_symlinks=False)
+                ]
+        except OSError:
+            log_files = []
         if log_files:
             st.write("**Log Files:**")
             for log_file in log_files:
                 with st.expander(f"View {log_file.name}"):
                     try:
-                        with open(log_file, 'r') as f:
-                            st.text(f.read())
+                        text, truncated = _tail(log_file)
+                        if truncated:
+                            st.caption(f"Showing the last {LOG_TAIL_BYTES // 1024} KiB")
+                            # The checkbox state lives in session_state, so a repeat render reads it without a widget
+                            full_log_key = f"full_log_{result.run_id}_{log_file.name}"
+                            if full_log_key not in self._rendered_widget_keys:
+                                self._rendered_widget_keys.add(full_log_key)
+                                st.checkbox("Show full log", key=full_log_key)
+                            if st.session_state.get(full_log_key):
+                                with open(log_file, 'r', buffering=LOG_READ_BUFFER_SIZE) as f:
+                                    text = f.read()
+                        st.text(text)
                     except Exception as e:
                         st.error(f"Error reading log file: {e}")
     
@@ -862,18 +1250,14 @@ class StreamlitPipelineUI:
         """Reset pipeline state."""
         st.session_state.pipeline_running = False
         st.session_state.current_results = None
-        st.session_state.progress_messages = []
+        st.session_state.progress_messages = deque(maxlen=PROGRESS_HISTORY_LIMIT)
         st.success("Pipeline state reset")
     
     def _show_config_summary(self) -> None:
         """Show configuration summary."""
         with st.expander("Configuration Summary", expanded=True):
             # Handle enum/string values safely
-            db_value = self.config.transvar.database
-            db_str = db_value.value if hasattr(db_value, 'value') else str(db_value)
-            
-            ref_value = self.config.transvar.ref_version
-            ref_str = ref_value.value if hasattr(ref_value, 'value') else str(ref_value)
+            db_str, ref_str = self._transvar_setting_strs()
             
             st.json({
                 'transvar': {
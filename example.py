@@ -5,6 +5,7 @@ Example script demonstrating the Genomics Automation Pipeline usage.
 This script shows how to use the pipeline programmatically without the Streamlit UI.
 """
 
+import csv
 import sys
 from pathlib import Path
 from genomics_automation.config import Config, KBSpec
@@ -113,16 +114,18 @@ def example_csv_processing():
     print("=" * 60)
     
     # Create example CSV file
-    csv_content = """gene,protein_change,transcript
-BRAF,p.V600E,NM_004333.4
-TP53,p.R273H,NM_000546.5
-EGFR,p.L858R,NM_005228.5
-KRAS,p.G12D,NM_033360.3
-"""
+    rows = [
+        ["gene", "protein_change", "transcript"],
+        ["BRAF", "p.V600E", "NM_004333.4"],
+        ["TP53", "p.R273H", "NM_000546.5"],
+        ["EGFR", "p.L858R", "NM_005228.5"],
+        ["KRAS", "p.G12D", "NM_033360.3"]
+    ]
     
     csv_path = Path("./example_variants.csv")
-    with open(csv_path, 'w') as f:
-        f.write(csv_content)
+    with open(csv_path, 'w', newline='') as f:
+        # One writerows call for the whole batch rather than a write per row
+        csv.writer(f, lineterminator='\n').writerows(rows)
     
     print(f"Created example CSV: {csv_path.absolute()}")
     
@@ -6,14 +6,89 @@ Production-ready version of the JSON to CSV converter.
 
 import json
 import csv
+import functools
+import operator
+import re
 import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator
 
-# Import our transcript selector
-sys.path.append(str(Path(__file__).parent.parent))
-from genomics_automation.transcript_config import default_transcript_selector
+# Stream variants with ijson when available, fallback to loading the whole document
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Parse whole documents with orjson when available, fallback to the stdlib parser
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Number of rows buffered before each bulk write to the CSV
+WRITE_BATCH_SIZE = 10_000
+
+# Buffer size for the input JSON and output CSV streams
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Shared default for missing nested sections; _EMPTY must not be mutated
+_EMPTY: dict = {}
+
+
+# Enhanced CSV columns, in output order
+CSV_FIELDNAMES = (
+    'variant_id',
+    'gene', 
+    'transcript', 
+    'preferred_transcript',
+    'transcript_preference_reason',
+    'hgvsc', 
+    'hgvsp', 
+    'protein_change',
+    'variant_type',
+    'clinical_significance', 
+    'evidence', 
+    'acmg_criteria', 
+    'confidence',
+    'gnomad_af', 
+    'gnomad_ac', 
+    'gnomad_an',
+    'sift_score', 
+    'sift_prediction', 
+    'polyphen_score', 
+    'polyphen_prediction',
+    'cadd_phred', 
+    'diseases', 
+    'therapeutic_implications'
+)
+
+# Row positions used by the converter (the status precedes the reason, so its index holds in both layouts)
+PREFERRED_STATUS_INDEX = CSV_FIELDNAMES.index('preferred_transcript')
+PREFERENCE_REASON_INDEX = CSV_FIELDNAMES.index('transcript_preference_reason')
+
+# Column positions kept when preference details are excluded
+_NO_REASON_INDICES = tuple(i for i in range(len(CSV_FIELDNAMES)) if i != PREFERENCE_REASON_INDEX)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_transcript_selector():
+    """
+    Import the shared transcript selector on first use.
+    
+    Deferring the genomics_automation import keeps --help and input
+    validation failures from paying for the package import.
+    """
+    sys.path.append(str(Path(__file__).parent.parent))
+    from genomics_automation.transcript_config import default_transcript_selector
+    return default_transcript_selector
+
+
+# Protein change with optional surrounding parentheses and whitespace, e.g. " (p.Arg123Gln) "
+_PROTEIN_CHANGE_PATTERN = re.compile(r'\s*(?:\((?P<wrapped>.*)\)|(?P<bare>.*?))\s*', re.DOTALL)
 
 
 def extract_protein_change(hgvsp: str) -> str:
@@ -29,32 +104,29 @@ def extract_protein_change(hgvsp: str) -> str:
     if not hgvsp:
         return ""
     
-    # Handle different formats
-    if ':' in hgvsp:
-        # Format: "NP_000123.1:p.Arg123Gln"
-        protein_part = hgvsp.split(':')[-1]
-    else:
-        # Format: "p.Arg123Gln"
-        protein_part = hgvsp
-    
-    # Clean up the protein change
-    protein_part = protein_part.strip()
+    # Drop any "NP_000123.1:" prefix, then unwrap "(p.Arg123Gln)" in one match
+    match = _PROTEIN_CHANGE_PATTERN.fullmatch(hgvsp.rpartition(':')[2])
+    protein_part = match.group('wrapped')
+    if protein_part is None:
+        protein_part = match.group('bare')
+        if not protein_part:
+            return ""
     
     # Ensure it starts with 'p.' if it doesn't already
-    if protein_part and not protein_part.startswith('p.'):
-        if protein_part.startswith('(') and protein_part.endswith(')'):
-            # Handle format like "(p.Arg123Gln)"
-            protein_part = protein_part[1:-1]
-        if not protein_part.startswith('p.'):
-            protein_part = f"p.{protein_part}"
+    if not protein_part.startswith('p.'):
+        protein_part = f"p.{protein_part}"
     
     return protein_part
 
 
+@functools.lru_cache(maxsize=4096)
 def analyze_transcript_preference(transcript: str, gene: str = None) -> tuple[str, str]:
     """
     Analyze transcript preference using the transcript selector.
     
+    Results are memoized on (transcript, gene) since the same transcripts
+    recur across variants of a gene and the selector is stateless.
+    
     Args:
         transcript: Transcript identifier
         gene: Optional gene name
@@ -65,7 +137,7 @@ def analyze_transcript_preference(transcript: str, gene: str = None) -> tuple[st
     if not transcript:
         return "Unknown", "No transcript provided"
     
-    is_preferred, reason = default_transcript_selector.is_preferred_transcript(transcript, gene)
+    is_preferred, reason = _get_transcript_selector().is_preferred_transcript(transcript, gene)
     
     if is_preferred:
         return "Yes", reason
@@ -73,8 +145,95 @@ def analyze_transcript_preference(transcript: str, gene: str = None) -> tuple[st
         return "No", reason
 
 
+def iter_variants(json_file) -> Iterator[Dict[str, Any]]:
+    """
+    Yield variant records from an open (binary) TPS JSON file.
+    
+    With ijson installed, variants are parsed one at a time so memory stays
+    bounded by a single record; otherwise the document is loaded in full.
+    
+    Args:
+        json_file: TPS JSON file opened in binary mode
+    
+    Returns:
+        Iterator over variant dictionaries
+    """
+    if HAS_IJSON:
+        # use_float keeps numbers as floats so CSV formatting matches json.load
+        return ijson.items(json_file, 'variants.item', use_float=True)
+    
+    data = orjson.loads(json_file.read()) if HAS_ORJSON else json.load(json_file)
+    return iter(data.get('variants', []))
+
+
+def build_variant_row(variant: Dict[str, Any]) -> List[Any]:
+    """
+    Build the CSV row for one variant, ordered as CSV_FIELDNAMES.
+    
+    Args:
+        variant: Variant record from the TPS JSON
+    
+    Returns:
+        List of column values, including the transcript preference reason
+    """
+    # Extract basic variant information
+    gene = variant.get('gene', '')
+    transcript = variant.get('transcript', '')
+    hgvsp = variant.get('hgvsp', '')
+    
+    # Analyze transcript preference
+    preferred_status, preference_reason = analyze_transcript_preference(transcript, gene)
+    
+    # Extract nested data structures once per variant
+    clinical_sig = variant.get('clinicalSignificance') or _EMPTY
+    pop_freq = (variant.get('populationFrequency') or _EMPTY).get('gnomad') or _EMPTY
+    func_pred = variant.get('functionalPredictions') or _EMPTY
+    sift = func_pred.get('sift') or _EMPTY
+    polyphen = func_pred.get('polyphen') or _EMPTY
+    cadd = func_pred.get('cadd') or _EMPTY
+    
+    # Format complex fields (most variants carry none, so skip the join entirely)
+    disease_assocs = variant.get('diseaseAssociations')
+    diseases = '; '.join([
+        f"{d['disease']} ({d.get('omim', 'N/A')})" for d in disease_assocs
+    ]) if disease_assocs else ''
+    
+    therapeutic_implications = variant.get('therapeuticImplications')
+    therapies = '; '.join([
+        f"{t['drug']} ({t['responseType']})" for t in therapeutic_implications
+    ]) if therapeutic_implications else ''
+    
+    acmg_criteria = clinical_sig.get('acmgCriteria')
+    
+    return [
+        variant.get('variant', ''),
+        gene,
+        transcript,
+        preferred_status,
+        preference_reason,
+        variant.get('hgvsc', ''),
+        hgvsp,
+        extract_protein_change(hgvsp),
+        variant.get('variantType', ''),
+        clinical_sig.get('classification', ''),
+        clinical_sig.get('evidence', ''),
+        ', '.join(acmg_criteria) if acmg_criteria else '',
+        clinical_sig.get('confidence', ''),
+        pop_freq.get('af', ''),
+        pop_freq.get('ac', ''),
+        pop_freq.get('an', ''),
+        sift.get('score', ''),
+        sift.get('prediction', ''),
+        polyphen.get('score', ''),
+        polyphen.get('prediction', ''),
+        cadd.get('phred', ''),
+        diseases,
+        therapies
+    ]
+
+
 def convert_tps_json_to_csv(input_json: str, output_csv: str, 
-                           include_preference_details: bool = True) -> None:
+                           include_preference_details: bool = True) -> int:
     """
     Convert TPS JSON output to enhanced CSV format with protein changes 
     and preferred transcript analysis.
@@ -83,115 +242,56 @@ def convert_tps_json_to_csv(input_json: str, output_csv: str,
         input_json: Path to input JSON file
         output_csv: Path to output CSV file
         include_preference_details: Whether to include detailed preference analysis
+    
+    Returns:
+        Number of variants written
     """
     
-    with open(input_json, 'r') as f:
-        data = json.load(f)
-    
-    variants = data.get('variants', [])
-    
-    # Define enhanced CSV columns
-    fieldnames = [
-        'variant_id',
-        'gene', 
-        'transcript', 
-        'preferred_transcript',
-        'transcript_preference_reason',
-        'hgvsc', 
-        'hgvsp', 
-        'protein_change',
-        'variant_type',
-        'clinical_significance', 
-        'evidence', 
-        'acmg_criteria', 
-        'confidence',
-        'gnomad_af', 
-        'gnomad_ac', 
-        'gnomad_an',
-        'sift_score', 
-        'sift_prediction', 
-        'polyphen_score', 
-        'polyphen_prediction',
-        'cadd_phred', 
-        'diseases', 
-        'therapeutic_implications'
-    ]
+    # Header and row builder for the requested columns, chosen once for the whole file
+    if include_preference_details:
+        fieldnames = CSV_FIELDNAMES
+        build_row = build_variant_row
+    else:
+        fieldnames = tuple(CSV_FIELDNAMES[i] for i in _NO_REASON_INDICES)
+        select_columns = operator.itemgetter(*_NO_REASON_INDICES)
+        
+        def build_row(variant):
+            return select_columns(build_variant_row(variant))
     
-    # If preference details are not needed, remove the reason column
-    if not include_preference_details:
-        fieldnames.remove('transcript_preference_reason')
+    variant_count = 0
+    preferred_count = 0
+    batch = []
     
-    with open(output_csv, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    with open(input_json, 'rb', buffering=IO_BUFFER_SIZE) as json_file, \
+            open(output_csv, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as csvfile:
+        # Positional rows skip DictWriter's per-column fieldname lookup
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
         
-        for variant in variants:
-            # Extract basic variant information
-            gene = variant.get('gene', '')
-            transcript = variant.get('transcript', '')
-            hgvsp = variant.get('hgvsp', '')
+        for variant in iter_variants(json_file):
+            row = build_row(variant)
+            preferred_status = row[PREFERRED_STATUS_INDEX]
             
-            # Extract protein change
-            protein_change = extract_protein_change(hgvsp)
+            # Rows are flushed in batches so the writer runs one writerows call per batch
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                writer.writerows(batch)
+                batch.clear()
             
-            # Analyze transcript preference
-            preferred_status, preference_reason = analyze_transcript_preference(transcript, gene)
-            
-            # Extract nested data structures
-            clinical_sig = variant.get('clinicalSignificance', {})
-            pop_freq = variant.get('populationFrequency', {}).get('gnomad', {})
-            func_pred = variant.get('functionalPredictions', {})
-            
-            # Format complex fields
-            diseases = '; '.join([
-                f"{d['disease']} ({d.get('omim', 'N/A')})" 
-                for d in variant.get('diseaseAssociations', [])
-            ])
-            
-            therapies = '; '.join([
-                f"{t['drug']} ({t['responseType']})" 
-                for t in variant.get('therapeuticImplications', [])
-            ])
-            
-            # Build the row
-            row = {
-                'variant_id': variant.get('variant', ''),
-                'gene': gene,
-                'transcript': transcript,
-                'preferred_transcript': preferred_status,
-                'hgvsc': variant.get('hgvsc', ''),
-                'hgvsp': hgvsp,
-                'protein_change': protein_change,
-                'variant_type': variant.get('variantType', ''),
-                'clinical_significance': clinical_sig.get('classification', ''),
-                'evidence': clinical_sig.get('evidence', ''),
-                'acmg_criteria': ', '.join(clinical_sig.get('acmgCriteria', [])),
-                'confidence': clinical_sig.get('confidence', ''),
-                'gnomad_af': pop_freq.get('af', ''),
-                'gnomad_ac': pop_freq.get('ac', ''),
-                'gnomad_an': pop_freq.get('an', ''),
-                'sift_score': func_pred.get('sift', {}).get('score', ''),
-                'sift_prediction': func_pred.get('sift', {}).get('prediction', ''),
-                'polyphen_score': func_pred.get('polyphen', {}).get('score', ''),
-                'polyphen_prediction': func_pred.get('polyphen', {}).get('prediction', ''),
-                'cadd_phred': func_pred.get('cadd', {}).get('phred', ''),
-                'diseases': diseases,
-                'therapeutic_implications': therapies
-            }
-            
-            # Add preference reason if requested
-            if include_preference_details:
-                row['transcript_preference_reason'] = preference_reason
-            
-            writer.writerow(row)
+            # Running totals for the summary (variants are streamed, so no second pass)
+            variant_count += 1
+            if preferred_status == "Yes":
+                preferred_count += 1
+        
+        if batch:
+            writer.writerows(batch)
     
-    print(f"✅ Converted {len(variants)} variants from {input_json} to {output_csv}")
+    print(f"✅ Converted {variant_count} variants from {input_json} to {output_csv}")
     
     # Print summary of transcript preferences
-    preferred_count = sum(1 for v in variants 
-                         if analyze_transcript_preference(v.get('transcript'), v.get('gene'))[0] == "Yes")
+    print(f"📊 Transcript Analysis: {preferred_count}/{variant_count} variants use preferred transcripts")
     
-    print(f"📊 Transcript Analysis: {preferred_count}/{len(variants)} variants use preferred transcripts")
+    return variant_count
 
 
 def main():
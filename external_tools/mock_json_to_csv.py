@@ -6,16 +6,50 @@ In production, this would be the actual converter script
 
 import json
 import csv
+import operator
 import sys
 import argparse
 
-def convert_tps_json_to_csv(input_json, output_csv):
-    """Convert TPS JSON output to CSV format"""
-    
-    with open(input_json, 'r') as f:
-        data = json.load(f)
+# Stream variants with ijson when available, fallback to loading the whole document
+try:
+    import ijson
+    HAS_IJSON = True
+except ImportError:
+    HAS_IJSON = False
+
+# Parse whole documents with orjson when available, fallback to the stdlib parser
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Number of rows buffered before each bulk write to the CSV
+WRITE_BATCH_SIZE = 1024
+
+# Buffer size for the input JSON and output CSV streams
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Shared default for missing nested sections; _EMPTY must not be mutated
+_EMPTY: dict = {}
+
+# Top-level variant fields fetched together in one C call
+CORE_FIELDS = ('variant', 'gene', 'transcript', 'hgvsc', 'hgvsp', 'variantType')
+CORE_DEFAULTS = ('',) * len(CORE_FIELDS)
+get_core_fields = operator.itemgetter(*CORE_FIELDS)
+
+
+def iter_variants(json_file):
+    """Yield variant records from a TPS JSON file opened in binary mode"""
+    if HAS_IJSON:
+        # use_float keeps numbers as floats so CSV formatting matches json.load
+        return ijson.items(json_file, 'variants.item', use_float=True)
     
-    variants = data.get('variants', [])
+    data = orjson.loads(json_file.read()) if HAS_ORJSON else json.load(json_file)
+    return iter(data.get('variants', []))
+
+def convert_tps_json_to_csv(input_json, output_csv):
+    """Convert TPS JSON output to CSV format, returning the number of variants written"""
     
     # Define CSV columns
     fieldnames = [
@@ -26,69 +60,95 @@ def convert_tps_json_to_csv(input_json, output_csv):
         'cadd_phred', 'diseases', 'therapeutic_implications'
     ]
     
-    with open(output_csv, 'w', newline='') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
+    variant_count = 0
+    batch = []
+    
+    with open(input_json, 'rb', buffering=IO_BUFFER_SIZE) as json_file, \
+            open(output_csv, 'w', newline='', encoding='utf-8', buffering=IO_BUFFER_SIZE) as csvfile:
+        # Positional rows skip DictWriter's per-column fieldname lookup
+        writer = csv.writer(csvfile)
+        writer.writerow(fieldnames)
         
-        for variant in variants:
+        for variant in iter_variants(json_file):
+            v_get = variant.get
+            try:
+                variant_id, gene, transcript, hgvsc, hgvsp, variant_type = get_core_fields(variant)
+            except KeyError:
+                # Sparse record: fall back to per-field defaults
+                variant_id, gene, transcript, hgvsc, hgvsp, variant_type = map(v_get, CORE_FIELDS, CORE_DEFAULTS)
+            
             # Extract nested data
-            clinical_sig = variant.get('clinicalSignificance', {})
-            pop_freq = variant.get('populationFrequency', {}).get('gnomad', {})
-            func_pred = variant.get('functionalPredictions', {})
+            clinical_sig = v_get('clinicalSignificance') or _EMPTY
+            pop_freq = (v_get('populationFrequency') or _EMPTY).get('gnomad') or _EMPTY
+            func_pred = v_get('functionalPredictions') or _EMPTY
+            c_get = clinical_sig.get
+            sift = func_pred.get('sift') or _EMPTY
+            polyphen = func_pred.get('polyphen') or _EMPTY
             
-            # Format diseases and therapies
+            # Format diseases and therapies (most variants carry none, so skip the join entirely)
+            disease_assocs = v_get('diseaseAssociations')
             diseases = '; '.join([
                 f"{d['disease']} ({d.get('omim', 'N/A')})" 
-                for d in variant.get('diseaseAssociations', [])
-            ])
+                for d in disease_assocs
+            ]) if disease_assocs else ''
             
+            therapeutic_implications = v_get('therapeuticImplications')
             therapies = '; '.join([
                 f"{t['drug']} ({t['responseType']})" 
-                for t in variant.get('therapeuticImplications', [])
-            ])
+                for t in therapeutic_implications
+            ]) if therapeutic_implications else ''
+            
+            acmg_criteria = c_get('acmgCriteria')
             
-            # Extract protein change from hgvsp or create it
-            hgvsp = variant.get('hgvsp', '')
-            protein_change = ""
-            if hgvsp:
-                # Extract just the protein change part (e.g., "p.Arg123Gln" from "NP_000123.1:p.Arg123Gln")
-                if ':' in hgvsp:
-                    protein_change = hgvsp.split(':')[-1]
-                else:
-                    protein_change = hgvsp
+            # Extract just the protein change part (e.g., "p.Arg123Gln" from "NP_000123.1:p.Arg123Gln");
+            # rpartition yields the whole string when there is no ':'
+            protein_change = hgvsp.rpartition(':')[2] if hgvsp else ""
             
             # Determine preferred transcript (in production this would come from database)
-            transcript = variant.get('transcript', '')
-            preferred_transcript = "Yes" if transcript and any(x in transcript.lower() for x in ['nm_', 'refseq', 'mane']) else "No"
+            # Lower once and test the markers inline rather than through an any() generator
+            transcript_lower = transcript.lower() if transcript else ''
+            preferred_transcript = "Yes" if (
+                'nm_' in transcript_lower or 'refseq' in transcript_lower or 'mane' in transcript_lower
+            ) else "No"
             
-            row = {
-                'variant_id': variant.get('variant', ''),
-                'gene': variant.get('gene', ''),
-                'transcript': transcript,
-                'preferred_transcript': preferred_transcript,
-                'hgvsc': variant.get('hgvsc', ''),
-                'hgvsp': hgvsp,
-                'protein_change': protein_change,
-                'variant_type': variant.get('variantType', ''),
-                'clinical_significance': clinical_sig.get('classification', ''),
-                'evidence': clinical_sig.get('evidence', ''),
-                'acmg_criteria': ', '.join(clinical_sig.get('acmgCriteria', [])),
-                'confidence': clinical_sig.get('confidence', ''),
-                'gnomad_af': pop_freq.get('af', ''),
-                'gnomad_ac': pop_freq.get('ac', ''),
-                'gnomad_an': pop_freq.get('an', ''),
-                'sift_score': func_pred.get('sift', {}).get('score', ''),
-                'sift_prediction': func_pred.get('sift', {}).get('prediction', ''),
-                'polyphen_score': func_pred.get('polyphen', {}).get('score', ''),
-                'polyphen_prediction': func_pred.get('polyphen', {}).get('prediction', ''),
-                'cadd_phred': func_pred.get('cadd', {}).get('phred', ''),
-                'diseases': diseases,
-                'therapeutic_implications': therapies
-            }
+            # Columns in fieldnames order
+            row = (
+                variant_id,
+                gene,
+                transcript,
+                preferred_transcript,
+                hgvsc,
+                hgvsp,
+                protein_change,
+                variant_type,
+                c_get('classification', ''),
+                c_get('evidence', ''),
+                ', '.join(acmg_criteria) if acmg_criteria else '',
+                c_get('confidence', ''),
+                pop_freq.get('af', ''),
+                pop_freq.get('ac', ''),
+                pop_freq.get('an', ''),
+                sift.get('score', ''),
+                sift.get('prediction', ''),
+                polyphen.get('score', ''),
+                polyphen.get('prediction', ''),
+                (func_pred.get('cadd') or _EMPTY).get('phred', ''),
+                diseases,
+                therapies
+            )
             
-            writer.writerow(row)
+            # Flush in batches so the writer runs one writerows call per batch
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH_SIZE:
+                writer.writerows(batch)
+                batch.clear()
+            variant_count += 1
+        
+        if batch:
+            writer.writerows(batch)
     
-    print(f"Converted {len(variants)} variants from {input_json} to {output_csv}")
+    print(f"Converted {variant_count} variants from {input_json} to {output_csv}")
+    return variant_count
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Convert TPS JSON to CSV')
@@ -2,10 +2,12 @@
 Configuration management using Pydantic models with environment overrides.
 """
 
+import functools
+import hashlib
 import os
 from pathlib import Path
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from enum import Enum
 
 
@@ -67,6 +69,10 @@ class ProcessingConfig(BaseModel):
         ge=1, description="Number of retry attempts for failed operations"
     )
     chunk_size: int = Field(100, ge=1, description="Batch processing chunk size")
+    zip_compression_level: int = Field(
+        default_factory=lambda: int(os.getenv("GENOMICS_ZIP_COMPRESSION_LEVEL", "1")),
+        ge=0, le=9, description="DEFLATE level for compressible files in results archives"
+    )
 
 
 class PathConfig(BaseModel):
@@ -134,6 +140,9 @@ class Config(BaseModel):
     debug_mode: bool = Field(False, description="Enable debug logging and intermediate file retention")
     preserve_intermediates: bool = Field(True, description="Keep intermediate files after processing")
     
+    # Path objects handed out by get_temp_dir/get_output_dir, keyed by path string
+    _created_dirs: Dict[str, Path] = PrivateAttr(default_factory=dict)
+    
     class Config:
         env_prefix = "GENOMICS_"
         case_sensitive = False
@@ -171,10 +180,25 @@ class Config(BaseModel):
                 "💡 Run: scripts/download_reference_genomes.sh to download hg19"
             )
     
+    def stable_hash(self) -> str:
+        """Return a fingerprint of the configuration values, stable across processes."""
+        return hashlib.sha256(self.model_dump_json().encode("utf-8")).hexdigest()
+    
     @classmethod
     def from_env(cls) -> "Config":
-        """Create configuration with environment variable overrides."""
-        return cls()
+        """
+        Create configuration with environment variable overrides.
+        
+        The environment is read and validated once; each call returns a deep
+        copy of that result, so callers can mutate their instance freely. Call
+        clear_env_cache() after changing GENOMICS_* variables.
+        """
+        return _config_from_env(cls).model_copy(deep=True)
+    
+    @classmethod
+    def clear_env_cache(cls) -> None:
+        """Drop the cached from_env() configuration so the next call re-reads the environment."""
+        _config_from_env.cache_clear()
     
     def get_transvar_flags(self) -> List[str]:
         """Get complete TransVar command flags."""
@@ -201,23 +225,31 @@ class Config(BaseModel):
     
     def get_temp_dir(self) -> Path:
         """Get temporary directory path, creating if necessary."""
-        if self.paths.temp_dir:
-            temp_path = Path(self.paths.temp_dir)
-        else:
-            temp_path = Path.cwd() / "temp"
-        
-        temp_path.mkdir(parents=True, exist_ok=True)
-        return temp_path
+        return self._ensure_dir(self.paths.temp_dir or os.path.join(os.getcwd(), "temp"))
     
     def get_output_dir(self) -> Path:
         """Get output directory path, creating if necessary."""
-        if self.paths.output_dir:
-            output_path = Path(self.paths.output_dir)
-        else:
-            output_path = Path.cwd() / "output"
+        return self._ensure_dir(self.paths.output_dir or os.path.join(os.getcwd(), "output"))
+    
+    def _ensure_dir(self, dir_path: str) -> Path:
+        """
+        Return dir_path as a Path, creating the directory if it is missing.
         
-        output_path.mkdir(parents=True, exist_ok=True)
-        return output_path
+        Paths are cached, but existence is re-checked on every call so a
+        directory removed since (e.g. by cleanup_temp_files) is recreated.
+        """
+        cached = self._created_dirs.get(dir_path)
+        if cached is None:
+            cached = self._created_dirs[dir_path] = Path(dir_path)
+        if not cached.is_dir():
+            cached.mkdir(parents=True, exist_ok=True)
+        return cached
+
+
+@functools.lru_cache(maxsize=None)
+def _config_from_env(config_cls: type) -> Config:
+    """Build and validate a configuration from the environment once per class; never hand this instance out."""
+    return config_cls()
 
 
 # Default configuration instance
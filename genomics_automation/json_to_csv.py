@@ -2,16 +2,44 @@
 JSON to CSV converter module - wrapper around existing converter script.
 """
 
+import importlib.util
 import subprocess
 import json
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass
 
+# Parse JSON with orjson when available, fallback to the stdlib parser
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 from .config import Config
 from .utils import validate_file_exists, read_csv_with_encoding_detection, write_csv_safely
 
 
+# Bytes read from the input to sanity-check that it looks like JSON
+JSON_SNIFF_BYTES = 4096
+
+# Summary line printed by the converter scripts, e.g. "Converted 12 variants from ..."
+_CONVERTED_COUNT_PATTERN = re.compile(r'Converted (\d+) variants')
+
+
+def _ensure_output_dir(output_dir: Path) -> Path:
+    """Create output_dir if it does not exist (it may have been cleaned up since the last call)."""
+    if not output_dir.is_dir():
+        output_dir.mkdir(parents=True, exist_ok=True)
+    return output_dir
+
+
 @dataclass
 class ConversionResult:
     """Result from JSON to CSV conversion."""
@@ -32,6 +60,42 @@ class JSONToCSVConverter:
     def __init__(self, config: Config):
         self.config = config
         self.converter_script_path = config.paths.json_to_csv_script
+        
+        # Per-call invariants, resolved once instead of on every conversion
+        self._script_str = str(self.converter_script_path) if self.converter_script_path else None
+        self._timeout = config.processing.timeout_seconds
+        self._default_output_dir: Optional[Path] = None
+        
+        # Python converter scripts are imported once and called directly
+        self._converter_fn = self._load_converter_function()
+    
+    def _load_converter_function(self) -> Optional[Callable[[str, str], Any]]:
+        """
+        Import the converter script's convert_tps_json_to_csv for in-process use.
+        
+        Returns:
+            The conversion function, or None if the script is not an importable
+            Python module exposing it (conversions then run as a subprocess)
+        """
+        if not self._script_str or not self._script_str.endswith('.py'):
+            return None
+        
+        try:
+            spec = importlib.util.spec_from_file_location(
+                f"_json_to_csv_{Path(self._script_str).stem}", self._script_str
+            )
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+        except Exception:
+            return None
+        
+        return getattr(module, 'convert_tps_json_to_csv', None)
+    
+    def _get_default_output_dir(self) -> Path:
+        """Get the default CSV output directory, creating it if it is missing."""
+        if self._default_output_dir is None:
+            self._default_output_dir = self.config.get_output_dir() / "csv_output"
+        return _ensure_output_dir(self._default_output_dir)
     
     def validate_setup(self) -> tuple[bool, str]:
         """
@@ -63,7 +127,7 @@ class JSONToCSVConverter:
         # Use positional arguments (matching mock script interface)
         cmd = [
             "python",  # Assuming it's a Python script
-            str(self.converter_script_path),
+            self._script_str,
             str(input_json),    # positional arg 1: input JSON file
             str(output_csv)     # positional arg 2: output CSV file
         ]
@@ -104,17 +168,16 @@ class JSONToCSVConverter:
                 error_message=f"Input JSON file not found: {input_json}"
             )
         
-        # Validate JSON format
+        # Cheap format check; the converter script does the one full parse
         try:
-            with open(input_json, 'r') as f:
-                json_data = json.load(f)
-                record_count = len(json_data) if isinstance(json_data, list) else 1
-        except json.JSONDecodeError as e:
-            return ConversionResult(
-                success=False,
-                input_json=input_json,
-                error_message=f"Invalid JSON format: {str(e)}"
-            )
+            with open(input_json, 'rb') as f:
+                head = f.read(JSON_SNIFF_BYTES).lstrip()
+            if head[:1] not in (b'{', b'['):
+                return ConversionResult(
+                    success=False,
+                    input_json=input_json,
+                    error_message="Invalid JSON format: expected an object or array"
+                )
         except Exception as e:
             return ConversionResult(
                 success=False,
@@ -122,23 +185,24 @@ class JSONToCSVConverter:
                 error_message=f"Error reading JSON file: {str(e)}"
             )
         
-        # Determine output path
+        # Determine output path (a stat per call; mkdir only when the directory is missing)
         if not output_dir:
-            output_dir = self.config.get_output_dir() / "csv_output"
+            output_dir = self._get_default_output_dir()
+        else:
+            _ensure_output_dir(output_dir)
         
         if not output_filename:
             output_filename = input_json.stem + ".csv"
         
         output_csv = output_dir / output_filename
         
-        # Ensure output directory exists
-        output_dir.mkdir(parents=True, exist_ok=True)
+        if self._converter_fn is not None:
+            return self._convert_in_process(input_json, output_csv)
         
         # Build command
         cmd = self.build_conversion_command(input_json, output_csv)
         
         try:
-            import time
             start_time = time.time()
             
             # Run conversion command
@@ -147,7 +211,7 @@ class JSONToCSVConverter:
                 capture_output=True,
                 text=True,
                 check=True,
-                timeout=self.config.processing.timeout_seconds
+                timeout=self._timeout
             )
             
             execution_time = time.time() - start_time
@@ -171,7 +235,7 @@ class JSONToCSVConverter:
                 command_used=" ".join(cmd),
                 stdout=result.stdout,
                 stderr=result.stderr,
-                record_count=record_count,
+                record_count=_count_converted_records(result.stdout, output_csv),
                 execution_time=execution_time
             )
         
@@ -179,7 +243,7 @@ class JSONToCSVConverter:
             return ConversionResult(
                 success=False,
                 input_json=input_json,
-                error_message=f"JSON to CSV conversion timed out after {self.config.processing.timeout_seconds} seconds",
+                error_message=f"JSON to CSV conversion timed out after {self._timeout} seconds",
                 command_used=" ".join(cmd)
             )
         
@@ -201,10 +265,103 @@ class JSONToCSVConverter:
                 command_used=" ".join(cmd)
             )
     
+    def _convert_in_process(self, input_json: Path, output_csv: Path) -> ConversionResult:
+        """
+        Run the imported converter function, avoiding a Python interpreter start per file.
+        
+        The call runs on its own daemon thread so processing.timeout_seconds
+        still applies, and writes to a temporary file that is renamed onto
+        output_csv only when it finishes in time. A thread that times out
+        cannot be killed: it is abandoned, its late output is discarded, and
+        later conversions (including retries) use the subprocess path instead.
+        
+        Args:
+            input_json: Path to input JSON file
+            output_csv: Path for output CSV file
+        
+        Returns:
+            ConversionResult with execution details
+        """
+        command_used = f"{self._script_str} (in-process)"
+        start_time = time.time()
+        temp_csv = output_csv.with_name(f".{output_csv.name}.{uuid.uuid4().hex}.tmp")
+        converter_fn = self._converter_fn
+        
+        future = Future()
+        
+        def run() -> None:
+            try:
+                outcome = _call_converter(converter_fn, input_json, temp_csv)
+            except BaseException as e:
+                # Not a conversion failure (e.g. KeyboardInterrupt); re-raised in the waiting thread
+                outcome, settle = e, future.set_exception
+            else:
+                settle = future.set_result
+            try:
+                settle(outcome)
+            except InvalidStateError:
+                # Abandoned after a timeout, so a late finish never reaches output_csv
+                temp_csv.unlink(missing_ok=True)
+        
+        threading.Thread(target=run, name=f"json_to_csv-{input_json.name}", daemon=True).start()
+        
+        try:
+            converted, error = future.result(timeout=self._timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                # The thread cannot be killed; later conversions and retries get a killable subprocess
+                self._converter_fn = None
+                return ConversionResult(
+                    success=False,
+                    input_json=input_json,
+                    error_message=f"JSON to CSV conversion timed out after {self._timeout} seconds",
+                    command_used=command_used
+                )
+            # Finished between the timeout and the cancel
+            converted, error = future.result()
+        
+        execution_time = time.time() - start_time
+        
+        if error is not None:
+            temp_csv.unlink(missing_ok=True)
+            if isinstance(error, SystemExit):
+                error_message = f"JSON to CSV conversion failed with exit code {error.code}"
+            else:
+                error_message = f"JSON to CSV conversion failed: {str(error)}"
+            return ConversionResult(
+                success=False,
+                input_json=input_json,
+                error_message=error_message,
+                command_used=command_used,
+                execution_time=execution_time
+            )
+        
+        try:
+            temp_csv.replace(output_csv)
+        except FileNotFoundError:
+            return ConversionResult(
+                success=False,
+                input_json=input_json,
+                error_message="CSV output file was not created despite successful conversion",
+                command_used=command_used,
+                execution_time=execution_time
+            )
+        
+        return ConversionResult(
+            success=True,
+            input_json=input_json,
+            output_csv=output_csv,
+            command_used=command_used,
+            # Both converter scripts return the number of variants written
+            record_count=converted if isinstance(converted, int) else _count_converted_records(None, output_csv),
+            execution_time=execution_time
+        )
+    
     def convert_batch_json_to_csv(
         self,
         json_files: List[Path],
-        output_dir: Optional[Path] = None
+        output_dir: Optional[Path] = None,
+        on_complete: Optional[Callable[[int, int], None]] = None
     ) -> List[ConversionResult]:
         """
         Convert multiple JSON files to CSV format.
@@ -212,15 +369,27 @@ class JSONToCSVConverter:
         Args:
             json_files: List of JSON file paths
             output_dir: Optional output directory
+            on_complete: Optional callback receiving (completed, total) after each
+                conversion finishes; always called from the calling thread
         
         Returns:
             List of ConversionResult objects
         """
-        results = []
-        
-        for json_file in json_files:
-            result = self.convert_json_to_csv(json_file, output_dir)
-            results.append(result)
+        if not json_files:
+            return []
+        
+        # Subprocess conversions overlap fully; in-process ones share the GIL but overlap their file I/O
+        max_workers = min(len(json_files), self.config.processing.max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.convert_json_to_csv, json_file, output_dir)
+                for json_file in json_files
+            ]
+            if on_complete:
+                for completed, _ in enumerate(as_completed(futures), 1):
+                    on_complete(completed, len(futures))
+            # Collect in submission order so results line up with json_files
+            results = [future.result() for future in futures]
         
         return results
     
@@ -298,8 +467,8 @@ class DirectJSONToCSVConverter:
             start_time = time.time()
             
             # Read JSON data
-            with open(input_json, 'r') as f:
-                json_data = json.load(f)
+            with open(input_json, 'rb') as f:
+                json_data = orjson.loads(f.read()) if HAS_ORJSON else json.load(f)
             
             # Ensure data is a list
             if not isinstance(json_data, list):
@@ -316,8 +485,12 @@ class DirectJSONToCSVConverter:
             if flatten_nested:
                 json_data = [_flatten_dict(record) for record in json_data]
             
+            # Union of columns in first-seen order, so records with extra or
+            # missing nested fields don't fail the write
+            fieldnames = list(dict.fromkeys(key for record in json_data for key in record))
+            
             # Write CSV
-            success = write_csv_safely(json_data, output_csv)
+            success = write_csv_safely(json_data, output_csv, fieldnames=fieldnames)
             execution_time = time.time() - start_time
             
             if success:
@@ -343,6 +516,44 @@ class DirectJSONToCSVConverter:
             )
 
 
+def _call_converter(converter_fn: Callable[[str, str], Any], input_json: Path, output_csv: Path) -> tuple:
+    """
+    Call an imported converter function, capturing any exception.
+    
+    SystemExit is caught too, so a converter calling sys.exit() fails only
+    this conversion; KeyboardInterrupt still propagates.
+    
+    Returns:
+        Tuple of (converter return value, exception or None)
+    """
+    try:
+        return converter_fn(str(input_json), str(output_csv)), None
+    except (Exception, SystemExit) as e:
+        return None, e
+
+
+def _count_converted_records(stdout: Optional[str], output_csv: Path) -> Optional[int]:
+    """
+    Get the number of converted records without re-parsing the input JSON.
+    
+    Args:
+        stdout: Converter script output, checked for its "Converted N variants" line
+        output_csv: CSV written by the converter, counted if stdout has no summary
+    
+    Returns:
+        Record count, or None if it cannot be determined
+    """
+    match = _CONVERTED_COUNT_PATTERN.search(stdout or '')
+    if match:
+        return int(match.group(1))
+    
+    try:
+        with open(output_csv, 'rb') as f:
+            return max(sum(1 for _ in f) - 1, 0)  # minus header
+    except OSError:
+        return None
+
+
 def _flatten_dict(d: Dict, parent_key: str = '', sep: str = '_') -> Dict:
     """
     Flatten nested dictionary structures.
@@ -355,17 +566,25 @@ def _flatten_dict(d: Dict, parent_key: str = '', sep: str = '_') -> Dict:
     Returns:
         Flattened dictionary
     """
-    items = []
-    for k, v in d.items():
-        new_key = f"{parent_key}{sep}{k}" if parent_key else k
-        if isinstance(v, dict):
-            items.extend(_flatten_dict(v, new_key, sep=sep).items())
-        elif isinstance(v, list):
-            # Convert list to string representation
-            items.append((new_key, json.dumps(v)))
+    flat = {}
+    # Stack of (key prefix, item iterator); descending into a nested dict pauses
+    # the parent's iterator, so keys come out in the same order as recursion
+    stack = [(parent_key, iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for k, v in items:
+            new_key = f"{prefix}{sep}{k}" if prefix else k
+            if isinstance(v, dict):
+                stack.append((new_key, iter(v.items())))
+                break
+            elif isinstance(v, list):
+                # Convert list to string representation
+                flat[new_key] = json.dumps(v)
+            else:
+                flat[new_key] = v
         else:
-            items.append((new_key, v))
-    return dict(items)
+            stack.pop()
+    return flat
 
 
 # Example configuration for different converter scripts
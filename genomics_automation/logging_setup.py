@@ -2,18 +2,53 @@
 Structured logging configuration with fallback for missing structlog.
 """
 
+import atexit
+import functools
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import socket
 import sys
+import time
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
 
+# Serialize JSON log records with orjson when available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
 # Try to import structlog, fallback to standard logging if not available
 try:
     import structlog
     HAS_STRUCTLOG = True
 except ImportError:
     HAS_STRUCTLOG = False
+    
+    # Shared processors for the fallback; factories hand these out instead of new closures
+    def _noop_processor(logger, method_name, event_dict):
+        return event_dict
+    
+    def _timestamp_processor(logger, method_name, event_dict):
+        event_dict["timestamp"] = datetime.now().isoformat()
+        return event_dict
+    
+    def _json_renderer(logger, method_name, event_dict):
+        if HAS_ORJSON:
+            return orjson.dumps(event_dict, default=str).decode()
+        return json.dumps(event_dict, default=str)
+    
+    def _console_renderer(logger, method_name, event_dict):
+        timestamp = event_dict.get("timestamp", "")
+        message = event_dict.get("event", "")
+        return f"[{timestamp}] {message}"
+    
     # Create a mock structlog interface
     class MockStructlog:
         @staticmethod
@@ -21,33 +56,23 @@ except ImportError:
             return logging.getLogger(name or __name__)
         
         class contextvars:
-            @staticmethod
-            def merge_contextvars():
-                return lambda logger, method_name, event_dict: event_dict
+            merge_contextvars = staticmethod(_noop_processor)
         
         class processors:
-            @staticmethod
-            def add_log_level():
-                return lambda logger, method_name, event_dict: event_dict
+            add_log_level = staticmethod(_noop_processor)
+            dict_tracebacks = staticmethod(_noop_processor)
             
             @staticmethod
             def TimeStamper(fmt="ISO"):
-                def add_timestamp(logger, method_name, event_dict):
-                    event_dict["timestamp"] = datetime.now().isoformat()
-                    return event_dict
-                return add_timestamp
+                return _timestamp_processor
             
             @staticmethod
             def CallsiteParameterAdder(parameters=None):
-                return lambda logger, method_name, event_dict: event_dict
-            
-            @staticmethod
-            def dict_tracebacks():
-                return lambda logger, method_name, event_dict: event_dict
+                return _noop_processor
             
             @staticmethod
             def JSONRenderer():
-                return lambda logger, method_name, event_dict: str(event_dict)
+                return _json_renderer
             
             class CallsiteParameter:
                 FUNC_NAME = "func_name"
@@ -55,11 +80,7 @@ except ImportError:
         class dev:
             @staticmethod
             def ConsoleRenderer(colors=True):
-                def render(logger, method_name, event_dict):
-                    timestamp = event_dict.get("timestamp", "")
-                    message = event_dict.get("event", "")
-                    return f"[{timestamp}] {message}"
-                return render
+                return _console_renderer
         
         @staticmethod
         def configure(*args, **kwargs):
@@ -76,39 +97,47 @@ except ImportError:
     structlog = MockStructlog()
 
 
-def setup_logging(
-    level: str = "INFO",
-    log_file: Optional[Path] = None,
-    run_id: Optional[str] = None
-):
+# Numeric levels by name, resolved once instead of via getattr on every call
+_LEVELS = {name: getattr(logging, name) for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")}
+
+# Records buffered for a run's background log writer before callers block
+LOG_QUEUE_SIZE = 10_000
+
+# Process-wide fields added to every record; refreshed in forked children so pid stays correct
+_STATIC_CONTEXT = {"host": socket.gethostname(), "pid": os.getpid()}
+
+
+def _refresh_pid() -> None:
+    _STATIC_CONTEXT["pid"] = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_refresh_pid)
+
+
+def _add_static_context(logger, method_name, event_dict):
+    """Processor adding the cached host/pid fields to a record."""
+    event_dict.update(_STATIC_CONTEXT)
+    return event_dict
+
+
+@functools.lru_cache(maxsize=None)
+def _build_processors(has_log_file: bool, include_callsite: bool) -> tuple:
     """
-    Configure structured logging for the genomics pipeline.
-    
-    Args:
-        level: Logging level (DEBUG, INFO, WARNING, ERROR)
-        log_file: Optional file path for logging
-        run_id: Optional run identifier for scoped logging
+    Build the structlog processor chain for a logging mode.
     
-    Returns:
-        Configured logger
+    The chain depends only on whether a log file and callsite fields are in
+    use, so it is built once per combination and reused by later calls.
     """
-    
-    # Configure standard library logging
-    logging.basicConfig(
-        format="%(message)s",
-        stream=sys.stdout,
-        level=getattr(logging, level.upper()),
-    )
-    
-    # Configure structlog
     processors = [
         structlog.contextvars.merge_contextvars,
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="ISO"),
+        _add_static_context,
     ]
     
-    # Add run_id to context if provided
-    if run_id:
+    # Callsite lookup walks stack frames on every record, so it is opt-in
+    if include_callsite:
         processors.append(
             structlog.processors.CallsiteParameterAdder(
                 parameters=[structlog.processors.CallsiteParameter.FUNC_NAME]
@@ -116,32 +145,124 @@ def setup_logging(
         )
     
     # Configure output format
-    if log_file:
+    if has_log_file:
         # JSON format for file logging
         processors.extend([
             structlog.processors.dict_tracebacks,
-            structlog.processors.JSONRenderer()
+            # orjson renders straight to bytes, which the file's BytesLogger writes as-is
+            structlog.processors.JSONRenderer(serializer=orjson.dumps)
+            if HAS_ORJSON and HAS_STRUCTLOG else structlog.processors.JSONRenderer()
         ])
-        
-        # Setup file handler
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, level.upper()))
-        logging.getLogger().addHandler(file_handler)
     else:
         # Human-readable format for console
         processors.extend([
             structlog.dev.ConsoleRenderer(colors=True)
         ])
     
-    structlog.configure(
-        processors=processors,
-        wrapper_class=structlog.make_filtering_bound_logger(
-            getattr(logging, level.upper())
-        ),
-        context_class=dict,
-        logger_factory=structlog.WriteLoggerFactory(),
-        cache_logger_on_first_use=True,
-    )
+    return tuple(processors)
+
+
+class _RedirectableStream:
+    """
+    File-like object that forwards writes to the current log file.
+    
+    Cached structlog loggers hold on to this object rather than the file
+    itself, so pointing logging at a new file redirects them instead of
+    leaving them bound to a closed stream.
+    """
+    
+    def __init__(self):
+        self._file = None
+    
+    def redirect(self, file) -> None:
+        """Send subsequent writes to file, closing the previous one."""
+        previous, self._file = self._file, file
+        if previous is not None:
+            previous.close()
+    
+    def write(self, data):
+        return self._file.write(data)
+    
+    def flush(self) -> None:
+        self._file.flush()
+
+
+# Arguments of the last structlog.configure call and the log file stream it writes to
+_configured_with: Optional[tuple] = None
+_log_stream = _RedirectableStream()
+
+
+def _open_log_stream(log_file: Path):
+    """Open log_file for appending, in binary mode when records are rendered by orjson."""
+    if HAS_ORJSON:
+        return open(log_file, "ab")
+    return open(log_file, "a", encoding="utf-8")
+
+
+def _file_logger_factory(log_file: Path):
+    """
+    Build a structlog logger factory that writes records directly to log_file.
+    
+    Bypasses the stdlib logging handler chain; loggers cached under a
+    previous configuration are redirected to the new file.
+    """
+    _log_stream.redirect(_open_log_stream(log_file))
+    if HAS_ORJSON:
+        return structlog.BytesLoggerFactory(file=_log_stream)
+    return structlog.WriteLoggerFactory(file=_log_stream)
+
+
+def setup_logging(
+    level: str = "INFO",
+    log_file: Optional[Path] = None,
+    run_id: Optional[str] = None,
+    include_callsite: bool = False
+):
+    """
+    Configure structured logging for the genomics pipeline.
+    
+    Args:
+        level: Logging level (DEBUG, INFO, WARNING, ERROR)
+        log_file: Optional file path for logging
+        run_id: Optional run identifier for scoped logging
+        include_callsite: Add the calling function name to each record
+    
+    Returns:
+        Configured logger
+    """
+    
+    global _configured_with
+    
+    numeric_level = _LEVELS[level.upper()]
+    
+    # Repeated calls with the same settings reuse the existing configuration
+    configuration = (numeric_level, log_file, include_callsite)
+    if configuration != _configured_with:
+        # Configure standard library logging
+        logging.basicConfig(
+            format="%(message)s",
+            stream=sys.stdout,
+            level=numeric_level,
+        )
+        
+        if log_file and HAS_STRUCTLOG:
+            logger_factory = _file_logger_factory(log_file)
+        else:
+            if log_file:
+                # Fallback loggers are stdlib loggers, so route the file through a handler
+                file_handler = logging.FileHandler(log_file)
+                file_handler.setLevel(numeric_level)
+                logging.getLogger().addHandler(file_handler)
+            logger_factory = structlog.WriteLoggerFactory()
+        
+        structlog.configure(
+            processors=list(_build_processors(bool(log_file), include_callsite)),
+            wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
+            context_class=dict,
+            logger_factory=logger_factory,
+            cache_logger_on_first_use=True,
+        )
+        _configured_with = configuration
     
     logger = structlog.get_logger()
     
@@ -151,23 +272,136 @@ def setup_logging(
     return logger
 
 
-def get_run_logger(run_dir: Path, run_id: str):
+class _QueuedLogWriter:
+    """
+    structlog logger that hands rendered records to a background writer thread.
+    
+    Callers only enqueue; a QueueListener thread performs the file writes, so
+    subprocess output draining never waits on disk I/O.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._newline = b"\n" if "b" in stream.mode else "\n"
+        self._queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        self._listener = logging.handlers.QueueListener(self._queue, self)
+        self._listener.start()
+        atexit.register(self.close)
+    
+    def msg(self, message):
+        self._queue.put(message)
+    
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+    
+    def handle(self, message):
+        """Write one record; called from the listener thread."""
+        self._stream.write(message)
+        self._stream.write(self._newline)
+    
+    def close(self):
+        """Drain queued records, then close the file."""
+        if self._stream.closed:
+            return
+        atexit.unregister(self.close)
+        self._listener.stop()
+        self._stream.close()
+
+
+class RunLogger:
+    """
+    Run-scoped logger writing to the run's own log file.
+    
+    Proxies the bound logger it wraps; call close() (or use it as a context
+    manager) when the run finishes to release the log file.
+    """
+    
+    def __init__(self, logger, close_fn):
+        self._logger = logger
+        self._close_fn = close_fn
+    
+    def __getattr__(self, name):
+        return getattr(self._logger, name)
+    
+    def close(self):
+        """Release the run's log file."""
+        if self._close_fn is not None:
+            self._close_fn()
+            self._close_fn = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def bind_run(
+    run_id: str,
+    log_file: Path,
+    level: str = "DEBUG",
+    include_callsite: bool = False
+) -> RunLogger:
+    """
+    Create a logger for one pipeline run without reconfiguring global logging.
+    
+    Args:
+        run_id: Unique identifier for the run
+        log_file: File receiving the run's JSON log records
+        level: Logging level for the run's records
+        include_callsite: Add the calling function name to each record (for debug runs)
+    
+    Returns:
+        RunLogger bound to run_id
+    """
+    numeric_level = _LEVELS[level.upper()]
+    
+    if HAS_STRUCTLOG:
+        writer = _QueuedLogWriter(_open_log_stream(log_file))
+        logger = structlog.wrap_logger(
+            writer,
+            processors=list(_build_processors(True, include_callsite)),
+            wrapper_class=structlog.make_filtering_bound_logger(numeric_level),
+            context_class=dict,
+        )
+        return RunLogger(logger.bind(run_id=run_id), writer.close)
+    
+    # Fallback: a dedicated stdlib logger per run, so handlers never pile up on the root logger
+    file_handler = logging.FileHandler(log_file, delay=True)
+    file_handler.setLevel(numeric_level)
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    run_logger = logging.getLogger(f"genomics.run.{run_id}")
+    run_logger.setLevel(numeric_level)
+    run_logger.addHandler(queue_handler)
+    
+    def close():
+        run_logger.removeHandler(queue_handler)
+        atexit.unregister(close)
+        listener.stop()
+        file_handler.close()
+    
+    atexit.register(close)
+    
+    return RunLogger(run_logger, close)
+
+
+def get_run_logger(run_dir: Path, run_id: str, include_callsite: bool = False) -> RunLogger:
     """
     Get a run-scoped logger that writes to a specific run directory.
     
     Args:
         run_dir: Directory for the current run
         run_id: Unique identifier for the run
+        include_callsite: Add the calling function name to each record
+            (e.g. pass config.debug_mode)
     
     Returns:
-        Configured logger for the run
+        RunLogger for the run; close it when the run finishes
     """
-    log_file = run_dir / f"pipeline_{run_id}.log"
-    return setup_logging(
-        level="DEBUG",
-        log_file=log_file,
-        run_id=run_id
-    )
+    return bind_run(run_id, run_dir / f"pipeline_{run_id}.log", include_callsite=include_callsite)
 
 
 class LogCapture:
@@ -176,38 +410,44 @@ class LogCapture:
     def __init__(self, logger, operation: str):
         self.logger = logger
         self.operation = operation
-        self.start_time = None
+        self.start_ns = None
+        # Event names for per-line output, built once instead of on every call
+        self._stdout_event = f"{operation} stdout"
+        self._stderr_event = f"{operation} stderr"
     
     def __enter__(self):
-        self.start_time = datetime.now()
+        self.start_ns = time.perf_counter_ns()
         self.logger.info(f"Starting {self.operation}")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = datetime.now() - self.start_time
+        # Monotonic clock; wall-clock timestamps come from the TimeStamper processor
+        duration = (time.perf_counter_ns() - self.start_ns) / 1e9
         
         if exc_type is None:
             self.logger.info(
                 f"Completed {self.operation}",
-                duration_seconds=duration.total_seconds()
+                duration_seconds=duration
             )
         else:
             self.logger.error(
                 f"Failed {self.operation}",
-                duration_seconds=duration.total_seconds(),
+                duration_seconds=duration,
                 error=str(exc_val),
                 exc_info=True
             )
     
     def log_stdout(self, output: str):
         """Log stdout from external process."""
-        if output.strip():
-            self.logger.debug(f"{self.operation} stdout", output=output.strip())
+        stripped = output.strip()
+        if stripped:
+            self.logger.debug(self._stdout_event, output=stripped)
     
     def log_stderr(self, output: str):
         """Log stderr from external process."""
-        if output.strip():
-            self.logger.warning(f"{self.operation} stderr", output=output.strip())
+        stripped = output.strip()
+        if stripped:
+            self.logger.warning(self._stderr_event, output=stripped)
 
 
 # Module-level logger
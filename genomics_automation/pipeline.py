@@ -2,9 +2,11 @@
 Main pipeline orchestrator for the genomics automation workflow.
 """
 
+import itertools
+import sys
 import time
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Union
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 
@@ -18,6 +20,15 @@ from .report_extractor import ReportExtractor
 from .utils import generate_run_id, create_run_directory, FileProcessor
 
 
+# Slotted dataclasses where supported (Python 3.10+); plain dataclasses otherwise
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Accepted CSV column names for variant input, in order of precedence
+GENE_COLUMNS = ('gene', 'Gene', 'GENE')
+PROTEIN_CHANGE_COLUMNS = ('protein_change', 'Protein_Change', 'variant', 'Variant')
+
+
 class PipelineStage(Enum):
     """Pipeline processing stages."""
     INPUT_VALIDATION = "input_validation"
@@ -30,7 +41,25 @@ class PipelineStage(Enum):
     COMPLETE = "complete"
 
 
-@dataclass
+# Number of pipeline stages, reported in run metrics
+_TOTAL_STAGES = len(PipelineStage)
+
+# Stages run after the VCF is ready, in order: (stage, GenomicsPipeline method,
+# config.stages flag, artifact key, error raised when disabled or None if optional).
+# Each stage consumes the previous stage's output.
+_STAGE_PLAN = (
+    (PipelineStage.SARJ_GENERATION, '_run_sarj', 'run_sarj', 'sarj_file',
+     "SARJ generation disabled but required for pipeline"),
+    (PipelineStage.TPS_PROCESSING, '_run_tps', 'run_tps', 'tps_json_files',
+     "TPS processing disabled but required for pipeline"),
+    (PipelineStage.JSON_TO_CSV, '_convert_json_to_csv', 'run_json_conversion', 'csv_files',
+     "JSON to CSV conversion disabled but required for pipeline"),
+    (PipelineStage.REPORT_EXTRACTION, '_extract_final_report', 'run_report_extraction', 'final_report',
+     None),
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class PipelineStatus:
     """Status update from pipeline processing."""
     stage: PipelineStage
@@ -40,16 +69,21 @@ class PipelineStatus:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PipelineInput:
     """Input specification for the pipeline."""
     mode: str  # "variants", "csv", "vcf"
     data: Any  # List of variants, CSV file path, or VCF file path
     preferred_transcripts: Optional[Dict[str, str]] = None
     output_dir: Optional[Path] = None
+    
+    def __post_init__(self):
+        # File modes carry a Path from here on, so later stages don't rebuild it
+        if self.mode in ("csv", "vcf") and self.data and isinstance(self.data, str):
+            self.data = Path(self.data)
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class PipelineResult:
     """Complete result from pipeline execution."""
     success: bool
@@ -78,20 +112,52 @@ class GenomicsPipeline:
         self.current_run_id = None
         self.current_run_dir = None
         self.status_callbacks = []
+        # _STAGE_PLAN with bound stage methods, resolved once per pipeline
+        self._stage_plan = tuple(
+            (stage, getattr(self, method), flag, artifact_key, disabled_error)
+            for stage, method, flag, artifact_key, disabled_error in _STAGE_PLAN
+        )
+        # Snapshot of status_callbacks iterated by _emit_status, rebuilt on add/remove
+        self._callbacks = ()
     
     def add_status_callback(self, callback) -> None:
         """Add a callback function for status updates."""
         self.status_callbacks.append(callback)
+        self._callbacks = tuple(self.status_callbacks)
+    
+    def remove_status_callback(self, callback) -> None:
+        """Remove a previously registered status callback, if present."""
+        if callback in self.status_callbacks:
+            self.status_callbacks.remove(callback)
+            self._callbacks = tuple(self.status_callbacks)
     
     def _emit_status(
         self,
         stage: PipelineStage,
         progress: float,
         message: str,
-        details: Optional[Dict[str, Any]] = None,
+        *args: Any,
+        details: Optional[Union[Dict[str, Any], Callable[[], Dict[str, Any]]]] = None,
         error: Optional[str] = None
     ) -> None:
-        """Emit status update to all registered callbacks."""
+        """
+        Emit status update to all registered callbacks.
+        
+        message is a %-format string filled from args, and details may be a
+        zero-argument callable returning the dict; both are only evaluated when
+        at least one callback is registered.
+        """
+        callbacks = self._callbacks
+        if not callbacks:
+            # Nobody is listening, so skip formatting and building the status object
+            return
+        
+        if args:
+            message = message % args
+        
+        if callable(details):
+            details = details()
+        
         status = PipelineStatus(
             stage=stage,
             progress=progress,
@@ -100,7 +166,7 @@ class GenomicsPipeline:
             error=error
         )
         
-        for callback in self.status_callbacks:
+        for callback in callbacks:
             try:
                 callback(status)
             except Exception as e:
@@ -130,61 +196,85 @@ class GenomicsPipeline:
             return False, "No input data provided"
         
         if pipeline_input.mode == "csv":
-            csv_path = Path(pipeline_input.data)
+            csv_path = pipeline_input.data
             if not csv_path.exists():
                 return False, f"CSV file not found: {csv_path}"
         
         if pipeline_input.mode == "vcf":
-            vcf_path = Path(pipeline_input.data)
+            vcf_path = pipeline_input.data
             if not vcf_path.exists():
                 return False, f"VCF file not found: {vcf_path}"
         
         return True, ""
     
-    def _process_variant_input(self, variants: List[Dict[str, str]]) -> tuple[List, Dict[str, Any]]:
-        """Process variant list input through TransVar."""
-        self._emit_status(
-            PipelineStage.TRANSVAR_ANNOTATION,
-            0.1,
-            f"Starting TransVar annotation for {len(variants)} variants"
-        )
+    def _process_variant_input(self, variants: Iterable[Dict[str, str]]) -> tuple[List, Dict[str, Any]]:
+        """Process variant list (or streamed variant) input through TransVar."""
+        # Streamed CSV input has no length up front, so progress is reported as a count only
+        total = len(variants) if isinstance(variants, list) else None
         
-        # Run TransVar annotation
+        if total is not None:
+            self._emit_status(
+                PipelineStage.TRANSVAR_ANNOTATION,
+                0.1,
+                "Starting TransVar annotation for %s variants", total
+            )
+        else:
+            self._emit_status(PipelineStage.TRANSVAR_ANNOTATION, 0.1, "Starting TransVar annotation")
+        
+        def report_progress(done: int) -> None:
+            if total:
+                self._emit_status(
+                    PipelineStage.TRANSVAR_ANNOTATION,
+                    0.1 + 0.7 * done / total,
+                    "TransVar annotation: %s/%s variants processed", done, total
+                )
+            else:
+                self._emit_status(
+                    PipelineStage.TRANSVAR_ANNOTATION,
+                    0.1,
+                    "TransVar annotation: %s variants processed", done
+                )
+        
+        # Run TransVar annotation; the adapter keeps up to processing.chunk_size calls in flight
         results, metrics = self.transvar_adapter.process_batch(
             variants,
-            preferred_transcripts={}  # Could be passed from input
+            preferred_transcripts={},  # Could be passed from input
+            on_chunk=report_progress
         )
         
         self._emit_status(
             PipelineStage.TRANSVAR_ANNOTATION,
             0.8,
-            f"TransVar annotation complete: {metrics['successful']} successful, {metrics['failed']} failed"
+            "TransVar annotation complete: %s successful, %s failed", metrics['successful'], metrics['failed']
         )
         
         return results, metrics
     
     def _process_csv_input(self, csv_path: Path) -> tuple[List, Dict[str, Any]]:
         """Process CSV input through TransVar."""
-        # Read CSV and convert to variant list
-        from .utils import read_csv_with_encoding_detection
-        
-        csv_data = read_csv_with_encoding_detection(csv_path)
+        return self._process_variant_input(self._iter_csv_variants(csv_path))
+    
+    @staticmethod
+    def _iter_csv_variants(csv_path: Path) -> Iterator[Dict[str, str]]:
+        """Stream variant dicts from a CSV file without loading it into memory."""
+        from .utils import iter_csv_with_encoding_detection
+        
+        rows = iter_csv_with_encoding_detection(csv_path)
+        first_row = next(rows, None)
+        if first_row is None:
+            return
+        
+        # Resolve column names once from the header; every DictReader row shares its keys
+        columns = first_row.keys()
+        gene_key = next((name for name in GENE_COLUMNS if name in columns), None)
+        pc_key = next((name for name in PROTEIN_CHANGE_COLUMNS if name in columns), None)
+        if not (gene_key and pc_key):
+            return
         
         # Convert CSV rows to variant format
-        variants = []
-        for row in csv_data:
-            # Look for common column names
-            gene = row.get('gene', row.get('Gene', row.get('GENE', '')))
-            protein_change = row.get('protein_change', row.get('Protein_Change', 
-                                   row.get('variant', row.get('Variant', ''))))
-            
-            if gene and protein_change:
-                variants.append({
-                    'gene': gene,
-                    'protein_change': protein_change
-                })
-        
-        return self._process_variant_input(variants)
+        for row in itertools.chain((first_row,), rows):
+            if row[gene_key] and row[pc_key]:
+                yield {'gene': row[gene_key], 'protein_change': row[pc_key]}
     
     def _generate_vcf(self, transvar_results: List) -> Path:
         """Generate VCF file from TransVar results."""
@@ -204,7 +294,7 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.VCF_GENERATION,
             1.0,
-            f"VCF generation complete: {vcf_stats['supported_variants']} variants processed",
+            "VCF generation complete: %s variants processed", vcf_stats['supported_variants'],
             details=vcf_stats
         )
         
@@ -226,8 +316,8 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.SARJ_GENERATION,
             1.0,
-            f"SARJ generation complete: {sarj_result.output_sarj}",
-            details={
+            "SARJ generation complete: %s", sarj_result.output_sarj,
+            details=lambda: {
                 'execution_time': sarj_result.execution_time,
                 'command_used': sarj_result.command_used
             }
@@ -245,7 +335,12 @@ class GenomicsPipeline:
         
         batch_result = self.tps_runner.run_tps_multi_kb(
             sarj_path,
-            output_dir=self.current_run_dir / "tps_output"
+            output_dir=self.current_run_dir / "tps_output",
+            on_complete=lambda done, total: self._emit_status(
+                PipelineStage.TPS_PROCESSING,
+                0.1 + 0.8 * done / total,
+                "TPS processing: %s/%s knowledge bases finished", done, total
+            )
         )
         
         if not batch_result.success or batch_result.successful_kbs == 0:
@@ -257,8 +352,8 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.TPS_PROCESSING,
             1.0,
-            f"TPS processing complete: {len(json_files)} knowledge bases processed",
-            details={
+            "TPS processing complete: %s knowledge bases processed", len(json_files),
+            details=lambda: {
                 'successful_kbs': batch_result.successful_kbs,
                 'failed_kbs': batch_result.failed_kbs,
                 'execution_time': batch_result.execution_time
@@ -272,13 +367,18 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.JSON_TO_CSV,
             0.1,
-            f"Converting {len(json_files)} JSON files to CSV"
+            "Converting %s JSON files to CSV", len(json_files)
         )
         
         csv_output_dir = self.current_run_dir / "csv_output"
         conversion_results = self.json_converter.convert_batch_json_to_csv(
             json_files,
-            csv_output_dir
+            csv_output_dir,
+            on_complete=lambda done, total: self._emit_status(
+                PipelineStage.JSON_TO_CSV,
+                0.1 + 0.8 * done / total,
+                "Converted %s/%s JSON files to CSV", done, total
+            )
         )
         
         successful_results = [r for r in conversion_results if r.success]
@@ -291,8 +391,8 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.JSON_TO_CSV,
             1.0,
-            f"JSON to CSV conversion complete: {len(csv_files)} files converted",
-            details={
+            "JSON to CSV conversion complete: %s files converted", len(csv_files),
+            details=lambda: {
                 'successful_conversions': len(successful_results),
                 'total_files': len(conversion_results)
             }
@@ -305,7 +405,7 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.REPORT_EXTRACTION,
             0.1,
-            f"Extracting final report from {len(csv_files)} CSV files"
+            "Extracting final report from %s CSV files", len(csv_files)
         )
         
         final_report_path = self.current_run_dir / "final_report.csv"
@@ -320,7 +420,7 @@ class GenomicsPipeline:
         self._emit_status(
             PipelineStage.REPORT_EXTRACTION,
             1.0,
-            f"Final report extracted: {extraction_result.records_extracted} records",
+            "Final report extracted: %s records", extraction_result.records_extracted,
             details=extraction_result.extraction_summary
         )
         
@@ -356,18 +456,18 @@ class GenomicsPipeline:
             # Process input to get VCF
             if pipeline_input.mode == "vcf":
                 # Use VCF directly
-                vcf_path = Path(pipeline_input.data)
+                vcf_path = pipeline_input.data
                 self._emit_status(
                     PipelineStage.VCF_GENERATION,
                     1.0,
-                    f"Using provided VCF file: {vcf_path}"
+                    "Using provided VCF file: %s", vcf_path
                 )
             else:
                 # Process through TransVar
                 if pipeline_input.mode == "variants":
                     transvar_results, transvar_metrics = self._process_variant_input(pipeline_input.data)
                 elif pipeline_input.mode == "csv":
-                    transvar_results, transvar_metrics = self._process_csv_input(Path(pipeline_input.data))
+                    transvar_results, transvar_metrics = self._process_csv_input(pipeline_input.data)
                 
                 stages_completed.append(PipelineStage.TRANSVAR_ANNOTATION)
                 artifacts['transvar_metrics'] = transvar_metrics
@@ -378,36 +478,19 @@ class GenomicsPipeline:
             stages_completed.append(PipelineStage.VCF_GENERATION)
             artifacts['vcf_file'] = vcf_path
             
-            # Run SARJ if enabled
-            if self.config.stages.run_sarj:
-                sarj_path = self._run_sarj(vcf_path)
-                stages_completed.append(PipelineStage.SARJ_GENERATION)
-                artifacts['sarj_file'] = sarj_path
-            else:
-                raise RuntimeError("SARJ generation disabled but required for pipeline")
-            
-            # Run TPS if enabled
-            if self.config.stages.run_tps:
-                json_files = self._run_tps(sarj_path)
-                stages_completed.append(PipelineStage.TPS_PROCESSING)
-                artifacts['tps_json_files'] = json_files
-            else:
-                raise RuntimeError("TPS processing disabled but required for pipeline")
-            
-            # Convert JSON to CSV if enabled
-            if self.config.stages.run_json_conversion:
-                csv_files = self._convert_json_to_csv(json_files)
-                stages_completed.append(PipelineStage.JSON_TO_CSV)
-                artifacts['csv_files'] = csv_files
-            else:
-                raise RuntimeError("JSON to CSV conversion disabled but required for pipeline")
+            # Run the remaining stages, each fed the previous stage's output
+            stage_flags = self.config.stages
+            stage_output = vcf_path
+            for stage, run_stage, flag, artifact_key, disabled_error in self._stage_plan:
+                if not getattr(stage_flags, flag):
+                    if disabled_error:
+                        raise RuntimeError(disabled_error)
+                    continue
+                stage_output = run_stage(stage_output)
+                stages_completed.append(stage)
+                artifacts[artifact_key] = stage_output
             
-            # Extract final report if enabled
-            final_report = None
-            if self.config.stages.run_report_extraction:
-                final_report = self._extract_final_report(csv_files)
-                stages_completed.append(PipelineStage.REPORT_EXTRACTION)
-                artifacts['final_report'] = final_report
+            final_report = artifacts.get('final_report')
             
             stages_completed.append(PipelineStage.COMPLETE)
             
@@ -416,7 +499,7 @@ class GenomicsPipeline:
             self._emit_status(
                 PipelineStage.COMPLETE,
                 1.0,
-                f"Pipeline completed successfully in {execution_time:.2f} seconds"
+                "Pipeline completed successfully in %.2f seconds", execution_time
             )
             
             return PipelineResult(
@@ -430,7 +513,7 @@ class GenomicsPipeline:
                 final_report=final_report,
                 metrics={
                     'stages_completed': len(stages_completed),
-                    'total_stages': len(PipelineStage),
+                    'total_stages': _TOTAL_STAGES,
                     'artifacts_generated': len(artifacts)
                 }
             )
@@ -443,7 +526,7 @@ class GenomicsPipeline:
             self._emit_status(
                 stages_completed[-1] if stages_completed else PipelineStage.INPUT_VALIDATION,
                 0.0,
-                f"Pipeline failed: {error_msg}",
+                "Pipeline failed: %s", error_msg,
                 error=error_msg
             )
             
@@ -3,15 +3,41 @@ Report extractor module for generating final reports from CSV data.
 """
 
 import csv
+import itertools
+import json
 from pathlib import Path
-from typing import List, Dict, Optional, Any, Set
-from dataclasses import dataclass
+from typing import Iterator, List, Dict, Optional, Any, Set, Tuple
+from dataclasses import dataclass, field
 import re
+from datetime import datetime
 
 from .config import Config
 from .utils import read_csv_with_encoding_detection, write_csv_safely
 
 
+# Column-name patterns for knowledge base result columns; group 1 is the result type
+_KB_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'kb_results?\.(.+)',
+    r'knowledge_base\.(.+)',
+    r'results?\.(.+)',
+    r'assertions?\.(.+)'
+))
+
+# Report field receiving each KB result type, by keyword; the first matching keyword wins
+_KB_ROUTES = (
+    ('diagnostic', 'diagnostic_assertions'),
+    ('prognostic', 'prognostic_assertions'),
+    ('therapeutic', 'therapeutic_assertions'),
+    ('treatment', 'therapeutic_assertions'),
+    ('trial', 'trial_ids'),
+    ('disease', 'diseases'),
+    ('condition', 'diseases'),
+)
+
+# Characters that can follow '[' (after whitespace) in a JSON array: a value start or ']'
+_JSON_ARRAY_STARTS = frozenset('"-0123456789[{tfn]')
+
+
 @dataclass
 class ReportField:
     """Configuration for a field in the final report."""
@@ -33,6 +59,16 @@ class ExtractionResult:
     extraction_summary: Optional[Dict[str, Any]] = None
 
 
+@dataclass
+class _ReportStats:
+    """Running totals collected while report records are streamed to disk."""
+    files_processed: int = 0
+    total_records: int = 0
+    file_summaries: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    populated_counts: Dict[str, int] = field(default_factory=dict)
+    kb_versions: Set[str] = field(default_factory=set)
+
+
 class ReportExtractor:
     """Extracts key information from CSV files to generate final reports."""
     
@@ -140,13 +176,22 @@ class ReportExtractor:
         """Add a custom field to the extraction configuration."""
         self.fields.append(field)
     
-    def _find_matching_column(self, available_columns: Set[str], field: ReportField) -> Optional[str]:
+    def _find_matching_column(
+        self,
+        available_columns: Set[str],
+        field: ReportField,
+        columns_by_lower: Optional[Dict[str, str]] = None
+    ) -> Optional[str]:
         """
         Find the first matching column for a field.
         
+        Exact matches are tried first, in source_columns order; failing that,
+        source columns are matched case-insensitively via columns_by_lower.
+        
         Args:
             available_columns: Set of available column names
             field: Field configuration
+            columns_by_lower: Optional mapping of lowercased to actual column names
         
         Returns:
             Matching column name or None
@@ -154,35 +199,60 @@ class ReportExtractor:
         for source_col in field.source_columns:
             if source_col in available_columns:
                 return source_col
+        
+        if columns_by_lower:
+            for source_col in field.source_columns:
+                column = columns_by_lower.get(source_col.lower())
+                if column is not None:
+                    return column
         return None
     
-    def _extract_kb_results(self, row: Dict[str, str]) -> Dict[str, str]:
+    def _resolve_kb_columns(self, columns) -> List[Tuple[str, str]]:
+        """
+        Find the knowledge base result columns in a CSV header.
+        
+        Args:
+            columns: Column names, in file order
+        
+        Returns:
+            List of (column, result_type) pairs, one per matching pattern
+        """
+        kb_columns = []
+        
+        for column in columns:
+            col_lower = column.lower()
+            for pattern in _KB_PATTERNS:
+                match = pattern.match(col_lower)
+                if match:
+                    kb_columns.append((column, match.group(1)))
+        
+        return kb_columns
+    
+    def _extract_kb_results(
+        self,
+        row: Dict[str, str],
+        kb_columns: Optional[List[Tuple[str, str]]] = None
+    ) -> Dict[str, str]:
         """
         Extract knowledge base results from a CSV row.
         
         Args:
             row: CSV row as dictionary
+            kb_columns: KB columns from _resolve_kb_columns; resolved from the
+                row's own keys when omitted
         
         Returns:
             Dictionary with extracted KB results
         """
+        if kb_columns is None:
+            kb_columns = self._resolve_kb_columns(row.keys())
+        
         kb_results = {}
         
-        # Look for KB results patterns
-        kb_patterns = [
-            r'kb_results?\.(.+)',
-            r'knowledge_base\.(.+)',
-            r'results?\.(.+)',
-            r'assertions?\.(.+)'
-        ]
-        
-        for column, value in row.items():
-            for pattern in kb_patterns:
-                match = re.match(pattern, column.lower())
-                if match:
-                    result_type = match.group(1)
-                    if value and value.strip():
-                        kb_results[result_type] = value
+        for column, result_type in kb_columns:
+            value = row.get(column)
+            if value and value.strip():
+                kb_results[result_type] = value
         
         return kb_results
     
@@ -206,8 +276,11 @@ class ReportExtractor:
         merged_items = []
         for value in clean_values:
             if value.startswith('[') and value.endswith(']'):
+                if value[1:].lstrip()[:1] not in _JSON_ARRAY_STARTS:
+                    # Bracketed text that cannot parse as a JSON array, e.g. "[mutation]"
+                    merged_items.append(value)
+                    continue
                 try:
-                    import json
                     items = json.loads(value)
                     if isinstance(items, list):
                         merged_items.extend(items)
@@ -216,23 +289,13 @@ class ReportExtractor:
                 except json.JSONDecodeError:
                     merged_items.append(value)
             else:
-                # Split on common delimiters
-                if ';' in value:
-                    merged_items.extend(v.strip() for v in value.split(';'))
-                elif ',' in value:
-                    merged_items.extend(v.strip() for v in value.split(','))
-                else:
-                    merged_items.append(value)
+                # Split on common delimiters; ';' wins when both appear, and a value
+                # without either splits to itself
+                delimiter = ';' if ';' in value else ','
+                merged_items.extend(v.strip() for v in value.split(delimiter))
         
         # Remove duplicates while preserving order
-        unique_items = []
-        seen = set()
-        for item in merged_items:
-            if item not in seen:
-                unique_items.append(item)
-                seen.add(item)
-        
-        return '; '.join(unique_items)
+        return '; '.join(dict.fromkeys(merged_items))
     
     def extract_from_csv(self, csv_file: Path) -> List[Dict[str, str]]:
         """
@@ -252,39 +315,42 @@ class ReportExtractor:
             available_columns = set(data[0].keys())
             extracted_records = []
             
+            # Case-insensitive column index, built in sorted order so spelling clashes resolve deterministically
+            columns_by_lower = {}
+            for column in sorted(available_columns, key=str):
+                if column is not None:
+                    columns_by_lower.setdefault(column.lower(), column)
+            
+            # Resolve each field's source column once per file; every row shares the header
+            resolved_fields = [
+                (field.name, field.default_value,
+                 self._find_matching_column(available_columns, field, columns_by_lower))
+                for field in self.fields
+            ]
+            kb_columns = self._resolve_kb_columns(data[0].keys())
+            
             for row in data:
                 extracted_row = {}
                 
                 # Extract standard fields
-                for field in self.fields:
-                    matching_column = self._find_matching_column(available_columns, field)
-                    
+                for name, default_value, matching_column in resolved_fields:
                     if matching_column:
                         value = row.get(matching_column, "").strip()
-                        extracted_row[field.name] = value if value else field.default_value
+                        extracted_row[name] = value if value else default_value
                     else:
-                        extracted_row[field.name] = field.default_value
+                        extracted_row[name] = default_value
                 
                 # Extract KB results
-                kb_results = self._extract_kb_results(row)
+                kb_results = self._extract_kb_results(row, kb_columns)
                 if kb_results:
                     # Merge KB results into relevant fields
                     for result_type, value in kb_results.items():
-                        if 'diagnostic' in result_type.lower():
-                            existing = extracted_row.get('diagnostic_assertions', '')
-                            extracted_row['diagnostic_assertions'] = self._merge_list_values([existing, value])
-                        elif 'prognostic' in result_type.lower():
-                            existing = extracted_row.get('prognostic_assertions', '')
-                            extracted_row['prognostic_assertions'] = self._merge_list_values([existing, value])
-                        elif 'therapeutic' in result_type.lower() or 'treatment' in result_type.lower():
-                            existing = extracted_row.get('therapeutic_assertions', '')
-                            extracted_row['therapeutic_assertions'] = self._merge_list_values([existing, value])
-                        elif 'trial' in result_type.lower():
-                            existing = extracted_row.get('trial_ids', '')
-                            extracted_row['trial_ids'] = self._merge_list_values([existing, value])
-                        elif 'disease' in result_type.lower() or 'condition' in result_type.lower():
-                            existing = extracted_row.get('diseases', '')
-                            extracted_row['diseases'] = self._merge_list_values([existing, value])
+                        # result_type comes from the lowercased column name
+                        for keyword, field_name in _KB_ROUTES:
+                            if keyword in result_type:
+                                existing = extracted_row.get(field_name, '')
+                                extracted_row[field_name] = self._merge_list_values([existing, value])
+                                break
                 
                 # Add source file information
                 extracted_row['source_file'] = csv_file.name
@@ -324,37 +390,23 @@ class ReportExtractor:
             output_file = self.config.get_output_dir() / "final_report.csv"
         
         try:
-            all_records = []
-            file_summaries = {}
+            stats = _ReportStats(populated_counts=dict.fromkeys((f.name for f in self.fields), 0))
+            records = self._iter_report_records(csv_files, stats)
             
-            # Extract from each CSV file
-            for csv_file in csv_files:
-                if not csv_file.exists():
-                    print(f"Warning: CSV file not found: {csv_file}")
-                    continue
-                
-                records = self.extract_from_csv(csv_file)
-                all_records.extend(records)
-                
-                file_summaries[str(csv_file)] = {
-                    'records_extracted': len(records),
-                    'file_size': csv_file.stat().st_size
-                }
-            
-            if not all_records:
+            first_record = next(records, None)
+            if first_record is None:
                 return ExtractionResult(
                     success=False,
                     input_files=csv_files,
                     error_message="No records extracted from any CSV files"
                 )
             
-            # Add record metadata
-            for i, record in enumerate(all_records):
-                record['record_id'] = f"record_{i+1:04d}"
-                record['extraction_timestamp'] = self._get_timestamp()
-            
-            # Write final report
-            success = write_csv_safely(all_records, output_file)
+            # Write final report, streaming the remaining records straight to disk
+            success = write_csv_safely(
+                itertools.chain((first_record,), records),
+                output_file,
+                fieldnames=list(first_record.keys())
+            )
             
             if not success:
                 return ExtractionResult(
@@ -366,18 +418,18 @@ class ReportExtractor:
             # Generate summary
             extraction_summary = {
                 'total_input_files': len(csv_files),
-                'files_processed': len([f for f in csv_files if f.exists()]),
-                'total_records': len(all_records),
-                'file_summaries': file_summaries,
-                'field_coverage': self._analyze_field_coverage(all_records),
-                'kb_versions_found': self._find_kb_versions(all_records)
+                'files_processed': stats.files_processed,
+                'total_records': stats.total_records,
+                'file_summaries': stats.file_summaries,
+                'field_coverage': self._analyze_field_coverage(stats.populated_counts, stats.total_records),
+                'kb_versions_found': sorted(stats.kb_versions)
             }
             
             return ExtractionResult(
                 success=True,
                 input_files=csv_files,
                 output_file=output_file,
-                records_extracted=len(all_records),
+                records_extracted=stats.total_records,
                 extraction_summary=extraction_summary
             )
         
@@ -388,16 +440,66 @@ class ReportExtractor:
                 error_message=f"Error building final report: {str(e)}"
             )
     
-    def _analyze_field_coverage(self, records: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Analyze field coverage across all records."""
-        if not records:
+    def _iter_report_records(
+        self,
+        csv_files: List[Path],
+        stats: _ReportStats
+    ) -> Iterator[Dict[str, str]]:
+        """
+        Yield numbered report records file by file.
+        
+        Only one input file's records are held at a time; file and record
+        totals, per-field populated counts and KB versions are collected into
+        stats as records are yielded.
+        
+        Args:
+            csv_files: List of CSV file paths
+            stats: Totals updated in place
+        
+        Returns:
+            Iterator over report records
+        """
+        # One extraction timestamp for the whole report
+        timestamp = self._get_timestamp()
+        
+        for csv_file in csv_files:
+            if not csv_file.exists():
+                print(f"Warning: CSV file not found: {csv_file}")
+                continue
+            
+            stats.files_processed += 1
+            records = self.extract_from_csv(csv_file)
+            
+            stats.file_summaries[str(csv_file)] = {
+                'records_extracted': len(records),
+                'file_size': csv_file.stat().st_size
+            }
+            
+            for record in records:
+                # Add record metadata
+                stats.total_records += 1
+                record['record_id'] = f"record_{stats.total_records:04d}"
+                record['extraction_timestamp'] = timestamp
+                
+                for name in stats.populated_counts:
+                    if record.get(name, '').strip():
+                        stats.populated_counts[name] += 1
+                
+                kb_version = record.get('kb_version', '').strip()
+                if kb_version:
+                    stats.kb_versions.add(kb_version)
+                
+                yield record
+    
+    def _analyze_field_coverage(self, populated_counts: Dict[str, int], total_records: int) -> Dict[str, Any]:
+        """Analyze field coverage from per-field counts of populated records."""
+        if not total_records:
             return {}
         
         field_stats = {}
-        total_records = len(records)
         
         for field in self.fields:
-            populated_count = sum(1 for record in records if record.get(field.name, '').strip())
+            populated_count = populated_counts[field.name]
             field_stats[field.name] = {
                 'populated_records': populated_count,
                 'coverage_percentage': (populated_count / total_records) * 100,
@@ -406,20 +508,8 @@ class ReportExtractor:
         
         return field_stats
     
-    def _find_kb_versions(self, records: List[Dict[str, str]]) -> List[str]:
-        """Find all knowledge base versions used in the records."""
-        kb_versions = set()
-        
-        for record in records:
-            kb_version = record.get('kb_version', '').strip()
-            if kb_version:
-                kb_versions.add(kb_version)
-        
-        return sorted(list(kb_versions))
-    
     def _get_timestamp(self) -> str:
         """Get current timestamp in ISO format."""
-        from datetime import datetime
         return datetime.now().isoformat()
     
     def generate_report_documentation(self) -> str:
@@ -3,8 +3,9 @@ SARJ (Nirvana Junior) runner module for generating SARJ files from VCF input.
 """
 
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Iterable, List, Optional, Any
 from dataclasses import dataclass
 
 from .config import Config
@@ -184,6 +185,34 @@ class SARJRunner:
                 command_used=" ".join(cmd)
             )
     
+    def run_sarj_many(
+        self,
+        input_vcfs: Iterable[Path],
+        output_dir: Optional[Path] = None,
+        max_parallel: Optional[int] = None
+    ) -> List[SARJResult]:
+        """
+        Run SARJ generation on several VCF files concurrently.
+        
+        Each job is a blocking subprocess, so threads are enough to keep
+        several SARJ processes running at once.
+        
+        Args:
+            input_vcfs: Paths to input VCF files
+            output_dir: Optional output directory shared by all jobs
+            max_parallel: Maximum concurrent jobs (defaults to processing.max_workers)
+        
+        Returns:
+            List of SARJResult, in the same order as input_vcfs
+        """
+        input_vcfs = list(input_vcfs)
+        if not input_vcfs:
+            return []
+        
+        max_workers = min(len(input_vcfs), max_parallel or self.config.processing.max_workers)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda vcf: self.run_sarj(vcf, output_dir), input_vcfs))
+    
     def get_sarj_info(self, sarj_file: Path) -> Dict[str, Any]:
         """
         Get information about a SARJ file.
@@ -5,7 +5,7 @@ TPS (Treatment Planning System) runner module for multi-KB Nirvana processing.
 import subprocess
 import json
 from pathlib import Path
-from typing import List, Dict, Optional, Any
+from typing import Callable, List, Dict, Optional, Any
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -233,7 +233,8 @@ class TPSRunner:
         input_sarj: Path,
         kb_versions: Optional[List[KBSpec]] = None,
         output_dir: Optional[Path] = None,
-        parallel: bool = True
+        parallel: bool = True,
+        on_complete: Optional[Callable[[int, int], None]] = None
     ) -> TPSBatchResult:
         """
         Run TPS processing across multiple knowledge bases.
@@ -243,6 +244,8 @@ class TPSRunner:
             kb_versions: List of knowledge base specifications (defaults to config KBs)
             output_dir: Output directory (defaults to config output dir)
             parallel: Whether to run KB processing in parallel
+            on_complete: Optional callback receiving (completed, total) after each
+                knowledge base finishes; always called from the calling thread
         
         Returns:
             TPSBatchResult with results for all knowledge bases
@@ -301,11 +304,15 @@ class TPSRunner:
                 for future in as_completed(future_to_kb):
                     result = future.result()
                     results.append(result)
+                    if on_complete:
+                        on_complete(len(results), len(kb_versions))
         else:
             # Process knowledge bases sequentially
             for kb in kb_versions:
                 result = self.run_tps_single_kb(input_sarj, kb, output_dir)
                 results.append(result)
+                if on_complete:
+                    on_complete(len(results), len(kb_versions))
         
         execution_time = time.time() - start_time
         
@@ -2,12 +2,13 @@
 TransVar adapter module - wraps TransVar CLI for protein annotation and VCF generation.
 """
 
+import itertools
 import re
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Any
+from typing import Callable, Iterable, List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import pandas as pd
 
 from .config import Config
@@ -372,22 +373,31 @@ class TransVarAdapter:
     
     def process_batch(
         self,
-        variants: List[Dict[str, str]],
-        preferred_transcripts: Optional[Dict[str, str]] = None
+        variants: Iterable[Dict[str, str]],
+        preferred_transcripts: Optional[Dict[str, str]] = None,
+        on_chunk: Optional[Callable[[int], None]] = None
     ) -> Tuple[List[TransVarResult], Dict[str, Any]]:
         """
         Process a batch of variants with parallel execution.
         
+        At most processing.chunk_size calls (or max_workers, if larger) are in
+        flight at once and each completion submits the next variant, so a
+        generator input is never materialized in full and workers never wait
+        on the slowest call of a chunk.
+        
         Args:
-            variants: List of variant dictionaries with 'gene' and 'protein_change' keys
+            variants: Iterable of variant dictionaries with 'gene' and 'protein_change' keys
             preferred_transcripts: Optional mapping of genes to preferred transcripts
+            on_chunk: Optional callback receiving the number of variants processed
+                so far, called after every processing.chunk_size completions and
+                once at the end
         
         Returns:
-            Tuple of (results, metrics)
+            Tuple of (results, metrics), with results in completion order
         """
         results = []
         metrics = {
-            'total': len(variants),
+            'total': 0,
             'successful': 0,
             'failed': 0,
             'auto_recovered': 0,
@@ -396,34 +406,49 @@ class TransVarAdapter:
         }
         
         preferred_transcripts = preferred_transcripts or {}
+        variant_iter = iter(variants)
+        chunk_size = self.config.processing.chunk_size
+        window = max(chunk_size, self.config.processing.max_workers)
         
         with ThreadPoolExecutor(max_workers=self.config.processing.max_workers) as executor:
-            # Submit jobs
-            future_to_variant = {}
-            for variant in variants:
-                gene = variant.get('gene', '')
-                protein_change = variant.get('protein_change', '')
-                transcript = preferred_transcripts.get(gene)
-                
-                future = executor.submit(
-                    self.run_transvar_panno,
-                    gene,
-                    protein_change,
-                    transcript
-                )
-                future_to_variant[future] = variant
+            def submit_next(count: int) -> set:
+                """Submit up to count more variants from the input."""
+                submitted = set()
+                for variant in itertools.islice(variant_iter, count):
+                    gene = variant.get('gene', '')
+                    protein_change = variant.get('protein_change', '')
+                    transcript = preferred_transcripts.get(gene)
+                    submitted.add(executor.submit(
+                        self.run_transvar_panno,
+                        gene,
+                        protein_change,
+                        transcript
+                    ))
+                metrics['total'] += len(submitted)
+                return submitted
             
-            # Collect results
-            for future in as_completed(future_to_variant):
-                result = future.result()
-                results.append(result)
+            # Sliding window: refill as calls complete instead of waiting out each chunk
+            pending = submit_next(window)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    results.append(result)
+                    
+                    if result.success:
+                        metrics['successful'] += 1
+                        if result.auto_recovery:
+                            metrics['auto_recovered'] += 1
+                    else:
+                        metrics['failed'] += 1
+                    
+                    if on_chunk and len(results) % chunk_size == 0:
+                        on_chunk(len(results))
                 
-                if result.success:
-                    metrics['successful'] += 1
-                    if result.auto_recovery:
-                        metrics['auto_recovered'] += 1
-                else:
-                    metrics['failed'] += 1
+                pending |= submit_next(len(done))
+        
+        if on_chunk and len(results) % chunk_size:
+            on_chunk(len(results))
         
         return results, metrics
 
@@ -8,13 +8,19 @@ import tempfile
 import time
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable, Optional, TypeVar, Dict, List
+from typing import Any, Callable, Optional, TypeVar, Dict, Iterable, Iterator, List
 import json
 import csv
 from datetime import datetime
 
 T = TypeVar('T')
 
+# Encodings tried, in order, when reading CSV input
+CSV_ENCODINGS = ('utf-8', 'utf-8-sig', 'latin1', 'cp1252')
+
+# Characters decoded per read while probing a file's encoding
+ENCODING_PROBE_CHUNK = 1 << 20
+
 
 def generate_run_id() -> str:
     """Generate a unique run identifier."""
@@ -187,7 +193,7 @@ def read_csv_with_encoding_detection(file_path: Path) -> List[Dict[str, str]]:
     Returns:
         List of dictionaries representing CSV rows
     """
-    encodings = ['utf-8', 'utf-8-sig', 'latin1', 'cp1252']
+    encodings = list(CSV_ENCODINGS)
     
     for encoding in encodings:
         try:
@@ -200,14 +206,64 @@ def read_csv_with_encoding_detection(file_path: Path) -> List[Dict[str, str]]:
     raise ValueError(f"Could not decode {file_path} with any of the attempted encodings: {encodings}")
 
 
-def write_csv_safely(data: List[Dict[str, Any]], file_path: Path, encoding: str = 'utf-8') -> bool:
+def detect_file_encoding(file_path: Path) -> str:
+    """
+    Find the first of CSV_ENCODINGS that decodes the whole file.
+    
+    The file is decoded in chunks and discarded, so memory stays bounded
+    regardless of file size.
+    
+    Args:
+        file_path: Path to the file
+    
+    Returns:
+        Name of the matching encoding
+    """
+    for encoding in CSV_ENCODINGS:
+        try:
+            with open(file_path, 'r', encoding=encoding) as f:
+                while f.read(ENCODING_PROBE_CHUNK):
+                    pass
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    
+    raise ValueError(f"Could not decode {file_path} with any of the attempted encodings: {list(CSV_ENCODINGS)}")
+
+
+def iter_csv_with_encoding_detection(file_path: Path) -> Iterator[Dict[str, str]]:
+    """
+    Stream CSV rows with automatic encoding detection.
+    
+    Same rows as read_csv_with_encoding_detection, yielded one at a time
+    instead of loaded into a list.
+    
+    Args:
+        file_path: Path to CSV file
+    
+    Returns:
+        Iterator over dictionaries representing CSV rows
+    """
+    encoding = detect_file_encoding(file_path)
+    with open(file_path, 'r', encoding=encoding) as f:
+        yield from csv.DictReader(f)
+
+
+def write_csv_safely(
+    data: Iterable[Dict[str, Any]],
+    file_path: Path,
+    encoding: str = 'utf-8',
+    fieldnames: Optional[List[str]] = None
+) -> bool:
     """
     Write CSV file with error handling.
     
     Args:
-        data: List of dictionaries to write
+        data: List of dictionaries to write, or an iterator of them when
+            fieldnames is given (rows are then streamed to disk)
         file_path: Output file path
         encoding: File encoding
+        fieldnames: Column order (defaults to the keys of the first record)
     
     Returns:
         True if successful, False otherwise
@@ -217,7 +273,7 @@ def write_csv_safely(data: List[Dict[str, Any]], file_path: Path, encoding: str
             return False
         
         with open(file_path, 'w', newline='', encoding=encoding) as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
+            writer = csv.DictWriter(f, fieldnames=fieldnames or data[0].keys())
             writer.writeheader()
             writer.writerows(data)
         
@@ -0,0 +1,131 @@
+"""
+Tests for the enhanced TPS JSON to CSV converter script.
+"""
+
+import csv
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+
+SCRIPT_PATH = Path(__file__).parent.parent / "external_tools" / "enhanced_json_to_csv.py"
+
+
+@pytest.fixture(scope="module")
+def converter():
+    """Load the converter script as a module (external_tools is not a package)."""
+    spec = importlib.util.spec_from_file_location("enhanced_json_to_csv", SCRIPT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestExtractProteinChange:
+    """Test protein change extraction from HGVS protein notation."""
+    
+    def test_accession_prefix_removed(self, converter):
+        """Test the protein accession prefix is dropped."""
+        test_cases = [
+            ("NP_000123.1:p.Arg123Gln", "p.Arg123Gln"),
+            ("NP_000537.3:p.Arg273His", "p.Arg273His"),
+            ("p.Val600Glu", "p.Val600Glu")
+        ]
+        
+        for hgvsp, expected in test_cases:
+            assert converter.extract_protein_change(hgvsp) == expected
+    
+    def test_parentheses_and_whitespace(self, converter):
+        """Test surrounding parentheses and whitespace are removed."""
+        test_cases = [
+            ("(p.Arg123Gln)", "p.Arg123Gln"),
+            ("NP_000123.1:(p.Arg123Gln)", "p.Arg123Gln"),
+            ("  p.Leu858Arg  ", "p.Leu858Arg"),
+            (" (p.Gly12Asp) ", "p.Gly12Asp")
+        ]
+        
+        for hgvsp, expected in test_cases:
+            assert converter.extract_protein_change(hgvsp) == expected
+    
+    def test_missing_prefix_added(self, converter):
+        """Test 'p.' is prepended when absent."""
+        assert converter.extract_protein_change("Arg123Gln") == "p.Arg123Gln"
+        assert converter.extract_protein_change("NP_000123.1:(Arg123Gln)") == "p.Arg123Gln"
+    
+    def test_inner_parentheses_kept(self, converter):
+        """Test predicted-change parentheses after 'p.' are left alone."""
+        assert converter.extract_protein_change("NP_000123.1:p.(Arg123Gln)") == "p.(Arg123Gln)"
+    
+    def test_empty_input(self, converter):
+        """Test empty notation and an empty protein part give an empty string."""
+        assert converter.extract_protein_change("") == ""
+        assert converter.extract_protein_change(None) == ""
+        assert converter.extract_protein_change("NP_000123.1:") == ""
+        assert converter.extract_protein_change("   ") == ""
+
+
+class TestConvertTPSJSONToCSV:
+    """Test CSV rows written for TPS variant records."""
+    
+    def _convert(self, converter, tmp_path, variants):
+        """Convert variants and read the CSV rows back keyed by column name."""
+        input_json = tmp_path / "tps.json"
+        output_csv = tmp_path / "tps.csv"
+        input_json.write_text(json.dumps({"variants": variants}))
+        
+        converter.convert_tps_json_to_csv(str(input_json), str(output_csv))
+        
+        with open(output_csv, newline='') as f:
+            return list(csv.DictReader(f))
+    
+    def test_disease_and_therapy_joins(self, converter, tmp_path):
+        """Test disease and therapy entries are joined with '; '."""
+        rows = self._convert(converter, tmp_path, [{
+            "gene": "BRCA1",
+            "diseaseAssociations": [
+                {"disease": "Breast cancer", "omim": "114480"},
+                {"disease": "Ovarian cancer"}
+            ],
+            "therapeuticImplications": [
+                {"drug": "Olaparib", "responseType": "Sensitive"},
+                {"drug": "Talazoparib", "responseType": "Sensitive"}
+            ]
+        }])
+        
+        assert rows[0]["diseases"] == "Breast cancer (114480); Ovarian cancer (N/A)"
+        assert rows[0]["therapeutic_implications"] == "Olaparib (Sensitive); Talazoparib (Sensitive)"
+    
+    def test_missing_or_empty_entries(self, converter, tmp_path):
+        """Test variants without disease or therapy entries get empty columns."""
+        rows = self._convert(converter, tmp_path, [
+            {"gene": "TP53"},
+            {"gene": "TP53", "diseaseAssociations": [], "therapeuticImplications": []},
+            {"gene": "TP53", "diseaseAssociations": None, "therapeuticImplications": None}
+        ])
+        
+        assert len(rows) == 3
+        for row in rows:
+            assert row["diseases"] == ""
+            assert row["therapeutic_implications"] == ""
+    
+    def test_nested_sections(self, converter, tmp_path):
+        """Test clinical, population and prediction sections fill their columns."""
+        rows = self._convert(converter, tmp_path, [{
+            "variant": "chr7:g.140453136A>T",
+            "gene": "BRAF",
+            "hgvsp": "NP_004324.2:p.Val600Glu",
+            "clinicalSignificance": {"classification": "Pathogenic", "acmgCriteria": ["PS3", "PM1"]},
+            "populationFrequency": {"gnomad": {"af": 1e-05}},
+            "functionalPredictions": {"cadd": {"phred": 32}}
+        }])
+        row = rows[0]
+        
+        assert row["variant_id"] == "chr7:g.140453136A>T"
+        assert row["protein_change"] == "p.Val600Glu"
+        assert row["clinical_significance"] == "Pathogenic"
+        assert row["acmg_criteria"] == "PS3, PM1"
+        assert row["gnomad_af"] == "1e-05"
+        assert row["gnomad_ac"] == ""
+        assert row["cadd_phred"] == "32"
+        assert row["sift_score"] == ""
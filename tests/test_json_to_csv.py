@@ -0,0 +1,104 @@
+"""
+Tests for JSON to CSV conversion helpers.
+"""
+
+import csv
+import json
+
+from genomics_automation.json_to_csv import DirectJSONToCSVConverter, _flatten_dict
+
+
+class TestFlattenDict:
+    """Test iterative flattening of nested records."""
+    
+    def test_nested_keys_joined(self):
+        """Test nested dictionaries are flattened with the separator."""
+        record = {
+            "gene": "BRCA1",
+            "clinical": {"classification": "Pathogenic", "review": {"stars": 2}},
+            "af": 0.01
+        }
+        
+        assert _flatten_dict(record) == {
+            "gene": "BRCA1",
+            "clinical_classification": "Pathogenic",
+            "clinical_review_stars": 2,
+            "af": 0.01
+        }
+    
+    def test_key_order_matches_depth_first_traversal(self):
+        """Test keys come out in the order a recursive flatten would produce."""
+        record = {"a": 1, "b": {"c": 2, "d": {"e": 3}, "f": 4}, "g": 5}
+        
+        assert list(_flatten_dict(record)) == ["a", "b_c", "b_d_e", "b_f", "g"]
+    
+    def test_lists_serialized_as_json(self):
+        """Test list values are stored as JSON strings."""
+        record = {"diseases": ["Breast cancer", "Ovarian cancer"], "nested": {"ids": [1, 2]}}
+        
+        flat = _flatten_dict(record)
+        
+        assert json.loads(flat["diseases"]) == ["Breast cancer", "Ovarian cancer"]
+        assert flat["nested_ids"] == "[1, 2]"
+    
+    def test_parent_key_and_separator(self):
+        """Test custom parent key and separator."""
+        assert _flatten_dict({"x": {"y": 1}}, parent_key="root", sep=".") == {"root.x.y": 1}
+    
+    def test_empty_nested_dict(self):
+        """Test empty nested dictionaries contribute no columns."""
+        assert _flatten_dict({"a": {}, "b": 1}) == {"b": 1}
+    
+    def test_deep_nesting(self):
+        """Test nesting deeper than the recursion limit does not overflow."""
+        record = leaf = {}
+        for _ in range(2000):
+            leaf["n"] = {}
+            leaf = leaf["n"]
+        leaf["value"] = 1
+        
+        flat = _flatten_dict(record)
+        
+        assert list(flat.values()) == [1]
+        assert next(iter(flat)).count("_") == 2000
+
+
+class TestDirectJSONToCSVConverter:
+    """Test the direct Python conversion fallback."""
+    
+    def test_columns_are_union_of_record_keys(self, tmp_path):
+        """Test records with differing fields are written over the union of columns."""
+        input_json = tmp_path / "variants.json"
+        output_csv = tmp_path / "variants.csv"
+        input_json.write_text(json.dumps([
+            {"gene": "BRCA1", "scores": {"cadd": 25}},
+            {"gene": "TP53", "scores": {"sift": 0.01}, "note": "hotspot"},
+            {"gene": "EGFR"}
+        ]))
+        
+        result = DirectJSONToCSVConverter.convert_direct(input_json, output_csv)
+        
+        assert result.success
+        assert result.record_count == 3
+        
+        with open(output_csv, newline='') as f:
+            reader = csv.DictReader(f)
+            rows = list(reader)
+        
+        # First-seen column order
+        assert reader.fieldnames == ["gene", "scores_cadd", "scores_sift", "note"]
+        assert rows[0] == {"gene": "BRCA1", "scores_cadd": "25", "scores_sift": "", "note": ""}
+        assert rows[1]["note"] == "hotspot"
+        assert rows[2] == {"gene": "EGFR", "scores_cadd": "", "scores_sift": "", "note": ""}
+    
+    def test_single_object_input(self, tmp_path):
+        """Test a top-level object is converted as one record."""
+        input_json = tmp_path / "variant.json"
+        output_csv = tmp_path / "variant.csv"
+        input_json.write_text(json.dumps({"gene": "KRAS", "change": "p.G12D"}))
+        
+        result = DirectJSONToCSVConverter.convert_direct(input_json, output_csv)
+        
+        assert result.success
+        assert result.record_count == 1
+        assert output_csv.read_text().splitlines() == ["gene,change", "KRAS,p.G12D"]
@@ -0,0 +1,131 @@
+"""
+Tests for final report extraction.
+"""
+
+import csv
+from pathlib import Path
+
+from genomics_automation.report_extractor import ReportExtractor
+from genomics_automation.config import Config
+
+
+def _write_csv(path: Path, rows):
+    """Write rows (list of dicts sharing keys) to a CSV file."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+class TestBuildFinalReport:
+    """Test streamed report building and its summary counts."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.extractor = ReportExtractor(Config())
+    
+    def test_records_streamed_across_files(self, tmp_path):
+        """Test records from every file are written in order with sequential ids."""
+        first = tmp_path / "clinvar.csv"
+        second = tmp_path / "cosmic.csv"
+        _write_csv(first, [
+            {"gene": "BRCA1", "variant": "p.R123Q", "kb_version": "clinvar_2023"},
+            {"gene": "TP53", "variant": "p.R273H", "kb_version": "clinvar_2023"},
+        ])
+        _write_csv(second, [
+            {"Gene": "EGFR", "Protein_Change": "p.L858R", "KB_Version": "cosmic_v97"},
+        ])
+        output_file = tmp_path / "final_report.csv"
+        
+        result = self.extractor.build_final_report([first, second], output_file)
+        
+        assert result.success
+        assert result.records_extracted == 3
+        
+        with open(output_file, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        
+        assert [row['gene'] for row in rows] == ["BRCA1", "TP53", "EGFR"]
+        assert [row['record_id'] for row in rows] == ["record_0001", "record_0002", "record_0003"]
+        assert [row['source_file'] for row in rows] == ["clinvar.csv", "clinvar.csv", "cosmic.csv"]
+        # One extraction timestamp for the whole report
+        assert len({row['extraction_timestamp'] for row in rows}) == 1
+    
+    def test_summary_counts(self, tmp_path):
+        """Test file, record, coverage and KB version totals."""
+        first = tmp_path / "a.csv"
+        second = tmp_path / "b.csv"
+        missing = tmp_path / "missing.csv"
+        _write_csv(first, [
+            {"gene": "BRCA1", "variant": "p.R123Q", "kb_version": "clinvar_2023"},
+            {"gene": "TP53", "variant": "", "kb_version": ""},
+        ])
+        _write_csv(second, [
+            {"gene": "EGFR", "variant": "p.L858R", "kb_version": "cosmic_v97"},
+            {"gene": "KRAS", "variant": "p.G12D", "kb_version": "clinvar_2023"},
+        ])
+        
+        result = self.extractor.build_final_report([first, missing, second], tmp_path / "report.csv")
+        summary = result.extraction_summary
+        
+        assert summary['total_input_files'] == 3
+        assert summary['files_processed'] == 2
+        assert summary['total_records'] == 4
+        assert summary['file_summaries'][str(first)]['records_extracted'] == 2
+        assert summary['file_summaries'][str(second)]['file_size'] == second.stat().st_size
+        assert str(missing) not in summary['file_summaries']
+        assert summary['kb_versions_found'] == ["clinvar_2023", "cosmic_v97"]
+        
+        coverage = summary['field_coverage']
+        assert coverage['gene']['populated_records'] == 4
+        assert coverage['variant']['populated_records'] == 3
+        assert coverage['variant']['coverage_percentage'] == 75.0
+        # Fields with a default value count as populated
+        assert coverage['inferred_classification']['populated_records'] == 4
+        assert coverage['trial_ids']['populated_records'] == 0
+    
+    def test_no_records(self, tmp_path):
+        """Test that a report without records fails and writes nothing."""
+        output_file = tmp_path / "report.csv"
+        
+        result = self.extractor.build_final_report([tmp_path / "missing.csv"], output_file)
+        
+        assert not result.success
+        assert result.error_message == "No records extracted from any CSV files"
+        assert not output_file.exists()
+
+
+class TestMergeListValues:
+    """Test merging of multi-valued report fields."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.extractor = ReportExtractor(Config())
+    
+    def test_duplicates_removed_in_first_seen_order(self):
+        """Test deduplication keeps the first occurrence of each item."""
+        result = self.extractor._merge_list_values(["b; a", "a; c; b"])
+        assert result == "b; a; c"
+    
+    def test_delimiter_choice(self):
+        """Test ';' wins over ',' and a value without either stays whole."""
+        test_cases = [
+            (["x, y"], "x; y"),
+            (["x; y, z"], "x; y, z"),
+            (["single value"], "single value"),
+            (["a,b", "c;d, e"], "a; b; c; d, e")
+        ]
+        
+        for values, expected in test_cases:
+            assert self.extractor._merge_list_values(values) == expected
+    
+    def test_json_arrays_merged(self):
+        """Test JSON arrays are expanded and bracketed text is kept as-is."""
+        assert self.extractor._merge_list_values(['["x", "y"]', "y; z"]) == "x; y; z"
+        assert self.extractor._merge_list_values(["[mutation]", "x"]) == "[mutation]; x"
+        assert self.extractor._merge_list_values(['[not json', "x"]) == "[not json; x"
+    
+    def test_empty_values(self):
+        """Test empty and whitespace-only values are ignored."""
+        assert self.extractor._merge_list_values(["", "  ", None]) == ""
+        assert self.extractor._merge_list_values(["", "a"]) == "a"
@@ -6,6 +6,7 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import subprocess
+import threading
 
 from genomics_automation.transvar_adapter import (
     TransVarAdapter,
@@ -253,6 +254,45 @@ class TestTransVarAdapter:
         assert metrics['total'] == 2
         assert metrics['successful'] == 2
         assert metrics['failed'] == 0
+    
+    def test_batch_processing_generator_input(self):
+        """Test generator input is consumed through a bounded window of in-flight calls."""
+        self.setUp()
+        self.config.processing.chunk_size = 3
+        self.config.processing.max_workers = 2
+        
+        lock = threading.Lock()
+        counts = {'pulled': 0, 'finished': 0, 'max_in_flight': 0}
+        
+        def variants():
+            for i in range(10):
+                with lock:
+                    counts['pulled'] += 1
+                yield {"gene": f"GENE{i}", "protein_change": f"p.A{i}T"}
+        
+        def fake_panno(gene, protein_change, transcript=None):
+            with lock:
+                counts['max_in_flight'] = max(counts['max_in_flight'], counts['pulled'] - counts['finished'])
+            # Odd-numbered variants fail so metrics split both ways
+            success = int(protein_change[3:-1]) % 2 == 0
+            result = TransVarResult(gene, transcript or "", protein_change, f"{gene}:{protein_change}", success)
+            with lock:
+                counts['finished'] += 1
+            return result
+        
+        progress = []
+        with patch.object(self.adapter, 'run_transvar_panno', side_effect=fake_panno):
+            results, metrics = self.adapter.process_batch(variants(), on_chunk=progress.append)
+        
+        # Results arrive in completion order, but every variant is processed exactly once
+        assert sorted(r.gene for r in results) == sorted(f"GENE{i}" for i in range(10))
+        assert metrics['total'] == 10
+        assert metrics['successful'] == 5
+        assert metrics['failed'] == 5
+        # Progress after every chunk_size completions, plus the remainder
+        assert progress == [3, 6, 9, 10]
+        # Never more than max(chunk_size, max_workers) variants pulled ahead of completed calls
+        assert counts['max_in_flight'] <= 3
 
 
 class TestVCFConversion: